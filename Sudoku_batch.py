@@ -0,0 +1,254 @@
+"""
+Batch generation of SUDOKU puzzles on a process pool.
+
+Every puzzle gets its own 64-bit seed drawn from the batch seed, so the output of a batch
+depends only on the batch seed and n, not on the number of workers or how puzzles are
+shared between them. Puzzles are returned as compact records of 81 character strings.
+
+Existing puzzles are solved the same way, streamed from a file and written out in input order
+with their status (unique, multiple, unsolvable, invalid or timeout), solving time and the
+number of cells that were filled by deduction alone.
+
+Command line usage:
+    python Sudoku_server.py generate 1000 -o puzzles.txt --seed 1
+    python Sudoku_server.py generate 1000000 -o puzzles.bin --format binary
+    python Sudoku_server.py store puzzles.db 100000 --difficulty hard
+    python Sudoku_server.py solve pack.txt -o solved.txt --timeout 5
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from collections import Counter
+from functools import partial
+from multiprocessing import Pool
+from random import Random, SystemRandom
+from typing import NamedTuple
+
+import Sudoku_grader
+from Sudoku_engine import Board, Budget, from_string, generate, search, to_string
+from Sudoku_io import FORMATS, read_puzzles, write_puzzles
+
+
+class PuzzleRecord(NamedTuple):
+    seed: int  # puzzle can be regenerated from this seed
+    puzzle: str  # 81 characters, empty cells are '.'
+    solution: str  # 81 characters
+
+
+def iter_seeds(seed: int):
+    """yields seeds for the puzzles of the batch"""
+    rng = Random(seed)
+    while True:
+        yield rng.getrandbits(64)
+
+
+def puzzle_seeds(seed: int, n: int) -> list[int]:
+    """returns seeds for n puzzles of the batch"""
+    return list(itertools.islice(iter_seeds(seed), n))
+
+
+SEED_RETRIES = 8  # seeds tried for a puzzle of the difficulty before giving up
+
+
+def make_record(seed: int, difficulty: str = None) -> PuzzleRecord:
+    """
+    generates a single puzzle record, of any difficulty if not given. If the seed gives no puzzle of
+    the difficulty, next seed is drawn from it and the record has the seed that was used
+    """
+    if difficulty is None:
+        puzzle, solution = generate(seed)
+        return PuzzleRecord(seed, to_string(puzzle), to_string(solution))
+
+    for _ in range(SEED_RETRIES):
+        try:
+            puzzle, solution, _ = Sudoku_grader.generate(seed, difficulty)
+        except ValueError:
+            seed = Random(seed).getrandbits(64)  # rare, stays reproducible from the batch seed
+            continue
+
+        return PuzzleRecord(seed, to_string(puzzle), to_string(solution))
+
+    raise ValueError(f'No {difficulty} puzzle found in {SEED_RETRIES} seeds')
+
+
+def imap_windowed(function, items, workers: int = None, chunksize: int = 16):
+    """
+    yields function(item) for every item in order, computed on a pool of worker processes.
+    Only a window of items is handed to the pool at a time, so memory use stays flat for endless items
+    """
+    workers = workers or os.cpu_count() or 1
+
+    # no need for the pool overhead with a single worker
+    if workers == 1:
+        yield from map(function, items)
+        return
+
+    items = iter(items)
+    window = workers * chunksize * 4
+    with Pool(workers) as pool:
+        while block := list(itertools.islice(items, window)):
+            yield from pool.imap(function, block, chunksize=chunksize)
+
+
+def iter_puzzles(n: int = None, workers: int = None, seed: int = None, chunksize: int = 16, difficulty: str = None):
+    """yields puzzle records as they are generated, endlessly if n is not given"""
+    if seed is None:
+        seed = SystemRandom().getrandbits(64)
+
+    seeds = itertools.islice(iter_seeds(seed), n)
+    yield from imap_windowed(partial(make_record, difficulty=difficulty), seeds, 1 if n == 1 else workers, chunksize)
+
+
+class SolveRecord(NamedTuple):
+    puzzle: str  # puzzle as it was read
+    solution: str | None  # first solution found, None if there is none
+    status: str  # one of STATUSES
+    seconds: float  # time spent solving
+    deduced: int = 0  # empty cells filled by deduction alone, before any guess
+
+
+STATUSES = ('unique', 'multiple', 'unsolvable', 'invalid', 'timeout')
+
+
+def solve_record(puzzle: str, timeout: float = None) -> SolveRecord:
+    """
+    solves puzzle string and finds out if its solution is unique, search is cut off after timeout seconds.
+    Puzzles that cannot be read or have duplicate numbers are invalid
+    """
+    start = time.perf_counter()
+
+    try:
+        board = Board(from_string(puzzle))
+    except ValueError:
+        return SolveRecord(puzzle, None, 'invalid', time.perf_counter() - start)
+
+    result = search(board, 2, Budget(seconds=timeout))
+
+    if result.found > 1:
+        status = 'multiple'
+    elif not result.complete:
+        status = 'timeout'
+    else:
+        status = 'unique' if result.found else 'unsolvable'
+
+    solution = to_string(result.solution) if result.solution else None
+    return SolveRecord(puzzle, solution, status, time.perf_counter() - start, result.deduced)
+
+
+def solve_puzzles(puzzles, workers: int = None, timeout: float = None, chunksize: int = 16):
+    """yields solve records of puzzle strings in input order, puzzles are read lazily and solved on a pool of workers"""
+    yield from imap_windowed(partial(solve_record, timeout=timeout), puzzles, workers, chunksize)
+
+
+def write_solved(file, records, chunk: int = 1024) -> Counter:
+    """
+    writes solve records to open file as lines of puzzle, solution (- if none), status, milliseconds and
+    cells filled by deduction, returns number of puzzles of every status
+    """
+    statuses = Counter()
+    buffer = []
+
+    for record in records:
+        statuses[record.status] += 1
+        buffer.append(
+            f'{record.puzzle} {record.solution or "-"} {record.status} {record.seconds * 1000:.3f} {record.deduced}\n'
+        )
+
+        if len(buffer) == chunk:
+            file.write(''.join(buffer))
+            buffer.clear()
+
+    file.write(''.join(buffer))
+    file.flush()
+
+    return statuses
+
+
+def generate_batch(n: int, workers: int = None, seed: int = None, chunksize: int = 16,
+                   difficulty: str = None) -> list[PuzzleRecord]:
+    """
+    generates n puzzles on a pool of worker processes, workers defaults to number of cpus.
+    Records are returned in the same order for the same seed no matter how many workers are used
+    """
+    return list(iter_puzzles(n, workers=workers, seed=seed, chunksize=chunksize, difficulty=difficulty))
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+
+def main(argv: list[str]) -> int:
+    """command line entry point, returns exit code"""
+    parser = argparse.ArgumentParser(prog='Sudoku_server.py', description='SUDOKU puzzle tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = commands.add_parser('generate', help='stream new puzzles to a file')
+    generate_parser.add_argument('count', type=int, help='number of puzzles')
+    generate_parser.add_argument('-o', '--output', default='-', help='output file, - for stdout (text only)')
+    generate_parser.add_argument('-f', '--format', choices=FORMATS, default='text')
+    generate_parser.add_argument('-s', '--seed', type=int, help='batch seed, random if not given')
+    generate_parser.add_argument('-w', '--workers', type=int, help='worker processes, defaults to number of cpus')
+    generate_parser.add_argument('-d', '--difficulty', choices=Sudoku_grader.LEVELS, help='level of the puzzles, any if not given')
+    generate_parser.add_argument('--solutions', action='store_true', help='add solution after the puzzle (text only)')
+
+    store_parser = commands.add_parser('store', help='add new puzzles to a puzzle store, equivalent puzzles are skipped')
+    store_parser.add_argument('path', help='SQLite file of the store, created if missing')
+    store_parser.add_argument('count', type=int, help='number of puzzles to generate')
+    store_parser.add_argument('-s', '--seed', type=int, help='batch seed, random if not given')
+    store_parser.add_argument('-w', '--workers', type=int, help='worker processes, defaults to number of cpus')
+    store_parser.add_argument('-d', '--difficulty', choices=Sudoku_grader.LEVELS, help='level of the puzzles, any if not given')
+
+    solve_parser = commands.add_parser('solve', help='solve puzzles of a file in input order and flag bad ones')
+    solve_parser.add_argument('input', help='puzzle file, - for stdin (text only)')
+    solve_parser.add_argument('-o', '--output', default='-', help='output file, - for stdout')
+    solve_parser.add_argument('-f', '--format', choices=FORMATS, default='text', help='format of the input')
+    solve_parser.add_argument('-w', '--workers', type=int, help='worker processes, defaults to number of cpus')
+    solve_parser.add_argument('-t', '--timeout', type=float, help='seconds per puzzle before it is given up as timeout')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        records = iter_puzzles(args.count, workers=args.workers, seed=args.seed, difficulty=args.difficulty)
+
+        if args.output == '-':
+            if args.format != 'text':
+                parser.error('binary format needs an output file')
+
+            write_puzzles(sys.stdout, records, solutions=args.solutions)
+        else:
+            mode = 'w' if args.format == 'text' else 'wb'
+            with open(args.output, mode) as file:
+                write_puzzles(file, records, args.format, solutions=args.solutions)
+
+    elif args.command == 'store':
+        from Sudoku_store import PuzzleStore
+
+        with PuzzleStore(args.path) as store:
+            added = store.fill(args.count, workers=args.workers, seed=args.seed, difficulty=args.difficulty)
+            print(f'> Added {added} of {args.count} puzzles, {args.count - added} were equivalent to stored ones')
+            print(f'> Store has {len(store)} puzzles')
+
+    elif args.command == 'solve':
+        if args.input == '-' and args.format != 'text':
+            parser.error('binary format needs an input file')
+
+        source = sys.stdin if args.input == '-' else open(args.input, 'r' if args.format == 'text' else 'rb')
+        target = sys.stdout if args.output == '-' else open(args.output, 'w')
+        start = time.perf_counter()
+
+        try:
+            puzzles = (puzzle for puzzle, _ in read_puzzles(source, args.format))
+            statuses = write_solved(target, solve_puzzles(puzzles, args.workers, args.timeout))
+        finally:
+            for file in (source, target):
+                if file not in (sys.stdin, sys.stdout):
+                    file.close()
+
+        seconds = time.perf_counter() - start
+        summary = ', '.join(f'{statuses[status]} {status}' for status in STATUSES)
+        print(f'> Solved {sum(statuses.values())} puzzles in {seconds:.1f} s: {summary}', file=sys.stderr)
+
+    return 0
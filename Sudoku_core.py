@@ -0,0 +1,488 @@
+"""
+Headless SUDOKU engine, importing it does not load PyQt5 or termcolor.
+
+Goals:
+1# generates sudoku puzzle that has only one way to complete it.
+
+SUDOKU rules:
+Rule 1 - Each row must contain the numbers from 1 to 9, without repetitions.
+Rule 2 - Each column must contain the numbers from 1 to 9, without repetitions.
+Rule 3 - The digits can only occur once per block (nonet).
+Rule 4 - The sum of every single row, column and nonet must equal 45.
+
+# A regular 9 x 9 grid is divided into 9 smaller blocks of 3 x 3, also known as nonets. The numbers from 1 to 9 can only occur once per nonet.
+
+# coordinates for puzzle. Cell in the puzzle are kept as str.
+
+      0   1   2   3   4   5   6   7   8
+    ╔═══╤═══╤═══╦═══╤═══╤═══╦═══╤═══╤═══╗
+ 0  ║   │   │   ║   │   │   ║   │   │   ║
+    ╟───┼───┼───╫───┼───┼───╫───┼───┼───╢
+ 1  ║   │   │   ║   │   │   ║   │   │   ║
+    ╟───┼───┼───╫───┼───┼───╫───┼───┼───╢
+ 2  ║   │   │   ║   │   │   ║   │   │   ║
+    ╠═══╪═══╪═══╬═══╪═══╪═══╬═══╪═══╪═══╣
+ 3  ║   │   │   ║   │   │   ║   │   │   ║
+    ╟───┼───┼───╫───┼───┼───╫───┼───┼───╢
+ 4  ║   │   │   ║   │   │   ║   │   │   ║
+    ╟───┼───┼───╫───┼───┼───╫───┼───┼───╢
+ 5  ║   │   │   ║   │   │   ║   │   │   ║
+    ╠═══╪═══╪═══╬═══╪═══╪═══╬═══╪═══╪═══╣
+ 6  ║   │   │   ║   │   │   ║   │   │   ║
+    ╟───┼───┼───╫───┼───┼───╫───┼───┼───╢
+ 7  ║   │   │   ║   │   │   ║   │   │   ║
+    ╟───┼───┼───╫───┼───┼───╫───┼───┼───╢
+ 8  ║   │   │   ║   │   │   ║   │   │   ║
+    ╚═══╧═══╧═══╩═══╧═══╧═══╩═══╧═══╧═══╝
+
+"""
+
+from dataclasses import InitVar, dataclass, field
+from math import isqrt
+from random import Random
+
+from Sudoku_engine import SYMBOLS, Board, Budget, Tracker, count_solutions, fits, flatten, generate, numbers_in, solve
+import Sudoku_dlx
+import Sudoku_grader
+from Sudoku_grader import Grade, Hint
+from Sudoku_grid import Grid, LockedCells
+from Sudoku_history import History, Snapshot
+from Sudoku_stats import Stats
+from Sudoku_transform import random_transform
+
+
+@dataclass
+class SUDOKU:
+    seed: int = None  # seed of the first puzzle, random if not given
+    rng: Random = field(default=None, repr=False, compare=False)  # draws seeds for new puzzles, seeded from seed if not given
+    ID: int = field(init=False)  # seed of the current puzzle, SUDOKU(seed=ID) regenerates the same puzzle
+    Puzzle: Grid = field(init=False)  # contains current state of the puzzle
+    orig_puzzle: Grid = field(init=False)  # contains original start of the puzzle
+    locked_coordinates: LockedCells = field(init=False)  # contains locked coordinates of the puzzle where number cannot be placed
+    solution: Grid = field(init=False)  # contains solution for the sudoku
+    _tracker: Tracker = field(init=False, repr=False, compare=False)  # conflict counters of the Puzzle
+    history: History = field(init=False, repr=False, compare=False)  # moves of the player, for undo and redo
+    _hint: tuple = field(init=False, default=None, repr=False, compare=False)  # (tracker, its changes, hint) of next_hint
+    debug = False
+    counter = 0  # solutions counter
+    backend: str = 'backtrack'  # solver used by solve and count_solutions, 'backtrack' or 'dlx'
+    difficulty: str = None  # level of new puzzles ('easy', 'medium', 'hard', 'expert'), any level if None
+    box: int = 3  # rows and columns of one box, 3 gives 9 x 9 board, 4 gives 16 x 16 and 5 gives 25 x 25
+    store: 'PuzzleStore' = field(default=None, repr=False, compare=False)  # Sudoku_store, new puzzles are taken from it first
+    stats: Stats = field(default=None, repr=False, compare=False)  # Sudoku_stats, counts work of generate, solve and checks
+    generate_on_init: InitVar[bool] = True  # if False puzzle is set later with generate or load
+
+    def __post_init__(self, generate_on_init: bool):
+        if self.rng is None:
+            self.rng = Random(self.seed)  # seeded from the system if seed is None
+
+        if generate_on_init:
+            self.generate(self.seed)
+
+    @classmethod
+    def from_puzzle(cls, puzzle, solution, seed: int = None, **kwargs) -> 'SUDOKU':
+        """makes game from ready puzzle and its solution without generating a new one"""
+        sudoku = cls(seed=seed, generate_on_init=False, **kwargs)
+        sudoku.load(puzzle, solution, seed)
+        return sudoku
+
+    def generate(self, seed: int = None, difficulty: str = None, budget: Budget = None):
+        """
+        generates new puzzle, same seed and difficulty give always the same puzzle.
+        Seed is drawn from self.rng and difficulty taken from self.difficulty if not given.
+        Without a seed a puzzle not served before is taken from self.store, if there is one.
+        Difficulty and store are supported on the classic 9 x 9 board only.
+        Raises ValueError and keeps the current game if no puzzle of the difficulty is found
+        or budget runs out before the puzzle is formed. Without difficulty a budget that runs out
+        while numbers are removed cuts the puzzle short, it has one solution but more numbers
+        """
+        difficulty = difficulty or self.difficulty
+
+        if difficulty is not None and self.box != 3:
+            raise ValueError('Difficulty can be chosen only for the 9 x 9 board')
+
+        if seed is None and self.store is not None and self.box == 3:
+            taken = self.store.take(difficulty)
+            if taken is not None:
+                self.load(*taken)
+                return
+
+        if seed is None:
+            seed = self.rng.getrandbits(64)
+
+        if difficulty is None:
+            puzzle, solution = generate(seed, self.box, self.stats, budget)
+        else:
+            puzzle, solution, _ = Sudoku_grader.generate(seed, difficulty, stats=self.stats, budget=budget)
+
+        self.load(puzzle, solution, seed)
+
+    def vary(self, seed: int = None):
+        """
+        starts new game from the current puzzle with its digits, rows and columns shuffled.
+        Takes microseconds instead of milliseconds of generate and the solution stays unique.
+        Transformation is drawn from self.rng if seed is not given
+        """
+        transform = random_transform(self.rng if seed is None else Random(seed), self.box)
+        self.load(transform(self.orig_puzzle.cells), transform(self.solution.cells))
+
+    def grade(self) -> Grade:
+        """grades the original puzzle with human solving techniques"""
+        return Sudoku_grader.grade(flatten(self.orig_puzzle))
+
+    def load(self, puzzle, solution, seed: int = None):
+        """
+        starts game from puzzle and its solution, given as nested grids (e.g. 9 x 9) or flat lists of cells.
+        Box size is taken from the puzzle
+        """
+        self.ID = seed
+        self.solution = Grid(solution) if isinstance(solution[0], int) else Grid.from_lists(solution)
+
+        new_puzzle = Grid(puzzle) if isinstance(puzzle[0], int) else Grid.from_lists(puzzle)
+        if new_puzzle.size != self.solution.size:
+            raise ValueError('Puzzle and solution must have the same size')
+
+        self.box = isqrt(new_puzzle.size)
+        self.Puzzle = new_puzzle  # user adds his numbers to this variable
+        self.orig_puzzle = new_puzzle.copy()  # this will house original starting point
+
+        self._find_locket_coordinates()
+        self._tracker = self.Puzzle.tracker = Tracker(self.Puzzle.cells)
+        self.history = History()
+
+    # ---------------------------
+    # Debug
+    # ---------------------------
+
+    def debugger(self, msg, grid, show_grid=True):
+        """gives debug message if enabled, prints the grid so keep it out of hot paths (use stats there)"""
+        if self.debug:
+            print(msg)
+
+            if show_grid:
+                for row in grid:
+                    print(row)
+
+                print('---------------------------------------------')
+
+    # ---------------------------
+    # Puzzle
+    # ---------------------------
+
+    def solve_puzzle(self, grid, budget: Budget = None) -> int:
+        """solves puzzle and returns number of possible solutions, or solutions found before budget ran out"""
+        solutions = self.count_solutions(grid, limit=0, budget=budget)
+        self.counter += solutions
+        return solutions
+
+    def count_solutions(self, grid: list[list], limit: int = 2, backend: str = None, budget: Budget = None) -> int:
+        """
+        returns number of solutions for the grid, counting stops when limit is reached (0 counts all)
+        or budget runs out, budget.exhausted tells if it did
+        """
+        backend = self._backend(backend)
+        cells = flatten(grid)
+
+        if backend == 'dlx':
+            return Sudoku_dlx.count(cells, limit, self.stats, budget)
+
+        try:
+            return count_solutions(Board(cells), limit, stats=self.stats, budget=budget)
+        except ValueError:
+            return 0  # grid has duplicates
+
+    def solve(self, grid: list[list], backend: str = None, budget: Budget = None) -> list[list] | None:
+        """
+        returns solved copy of the grid or None if grid has no solution or budget runs out,
+        budget.exhausted tells which one
+        """
+        backend = self._backend(backend)
+        cells = flatten(grid)
+
+        if backend == 'dlx':
+            solution = Sudoku_dlx.solve(cells, self.stats, budget)
+        else:
+            try:
+                solution = solve(Board(cells), self.stats, budget)
+            except ValueError:
+                solution = None  # grid has duplicates
+
+        if solution is None:
+            return None
+
+        size = len(grid)
+        return [solution[row * size:row * size + size] for row in range(size)]
+
+    def _backend(self, backend: str = None) -> str:
+        """returns backend for the call, instance backend is used if not given"""
+        backend = backend or self.backend
+
+        if backend not in ('backtrack', 'dlx'):
+            raise ValueError(f'Unknown solver backend {backend!r}')
+
+        return backend
+
+    @staticmethod
+    def find_empty_square(grid: list[list]):
+        """if there is empty cell in grid"""
+
+        for row in grid:
+            if 0 in row:
+                return True
+
+        return False
+
+    def valid_location(self, grid: list[list], row: int, col: int, number: int) -> bool:
+        """verify if number can be put to grid in row, col location"""
+        if self.stats is not None:
+            self.stats.checks += 1
+
+        return fits(grid, row, col, number)
+
+    def _find_locket_coordinates(self):
+        """finds locked coordinates from the puzzle"""
+        self.locked_coordinates = LockedCells.from_grid(self.orig_puzzle)
+
+    def validate_sudoku(self, grid: list[list]) -> bool:
+        """validates full sudoku puzzle"""
+        try:
+            Board.from_grid(grid)
+        except ValueError as e:
+            self.debugger(f'Not valid sudoku, {e}', grid)
+            return False
+
+        return True
+
+    @staticmethod
+    def validate_many(grids, require_complete: bool = False):
+        """validates (N, 9, 9) array of grids at once, returns valid boards and their conflicting cells"""
+        from Sudoku_validate import validate_many  # numpy is imported only when needed
+
+        return validate_many(grids, require_complete)
+
+    # ---------------------------
+    # Place
+    # ---------------------------
+
+    def place_number(self, y: int, x: int, num: int) -> bool:
+        """
+        add number to grid if it fits, reason is printed if it does not
+        """
+        error = self.placement_error(y, x, num)
+        if error is not None:
+            print(f'> {error}')
+            return False
+
+        size = self.Puzzle.size
+
+        # number is written through the tracker, so its conflicts are counted in O(1)
+        tracker = self._track()
+        i = y * size + x
+        old = self.Puzzle.cells[i]
+
+        if old != num:
+            tracker.set(i, num)
+            self.history.record(i, old, num)
+
+        return True
+
+    def placement_error(self, y: int, x: int, num: int) -> str | None:
+        """returns why number cannot be placed to row y, col x, or None if it can"""
+        size = self._track().geometry.size
+
+        # number is not in limits
+        if not 0 <= num <= size:
+            return f'Number {num} was not in allowed limits'
+
+        # coordinates not in limits
+        for coord in [y, x]:
+            if not 0 <= coord < size:
+                return f'Coordinate Number {coord} was not in allowed limits'
+
+        # coordinates are locked
+        if (y, x) in self.locked_coordinates:
+            return 'Cannot place number to locked coordinates!'
+
+        return None
+
+    def fill_solution(self) -> list[tuple[int, int]]:
+        """
+        writes the solution to the open cells of the puzzle as one move that can be undone,
+        returns (row, col) of the changed cells. Puzzle stays its own grid, so the solution is not touched
+        """
+        tracker = self._track()
+        cells = self.Puzzle.cells
+        size = self.Puzzle.size
+        changed = []
+
+        for i, number in enumerate(self.solution.cells):
+            old = cells[i]
+            if old != number:
+                tracker.set(i, number)
+                self.history.record(i, old, number, joined=bool(changed))
+                changed.append((i // size, i % size))
+
+        return changed
+
+    def undo(self) -> list[tuple[int, int]]:
+        """takes back the latest move, returns (row, col) of the changed cells, empty if there was nothing to undo"""
+        self._track()  # history of a replaced Puzzle is cleared first
+        return self._write(self.history.undo())
+
+    def redo(self) -> list[tuple[int, int]]:
+        """makes the latest undone move again, returns (row, col) of the changed cells, empty if there was nothing to redo"""
+        self._track()
+        return self._write(self.history.redo())
+
+    def snapshot(self) -> Snapshot:
+        """returns state of the puzzle to go back to with restore, it is a position in the history and copies nothing"""
+        return self.history.snapshot()
+
+    def restore(self, snapshot: Snapshot) -> list[tuple[int, int]]:
+        """
+        returns puzzle to the snapshot, moves after it can be redone. Returns (row, col) of the changed cells,
+        raises ValueError if the snapshot has been dropped from the history by a move made after undo
+        """
+        self._track()
+        return self._write(self.history.seek(snapshot))
+
+    def _write(self, writes: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """writes (cell, number) from the history without recording them, returns (row, col) of the cells"""
+        tracker = self._track()
+        size = self.Puzzle.size
+
+        for i, number in writes:
+            tracker.set(i, number)
+
+        return [(i // size, i % size) for i, _ in writes]
+
+    def conflicts(self) -> list[tuple[int, int]]:
+        """returns (row, col) of cells in the puzzle that share their number with a cell in row, column or nonet"""
+        size = self.Puzzle.size
+        return [(i // size, i % size) for i in self._track().conflicts]
+
+    def candidates(self) -> dict[tuple[int, int], list[int]]:
+        """
+        returns numbers that fit to every empty cell by (row, col), wrong numbers of the player count as well.
+        Numbers used in every unit are kept up to date by the moves, so this does not rescan the units
+        """
+        tracker = self._track()
+        size = self.Puzzle.size
+
+        return {
+            (i // size, i % size): numbers_in(tracker.candidates(i))
+            for i, number in enumerate(self.Puzzle.cells) if not number
+        }
+
+    def next_hint(self) -> Hint | None:
+        """
+        returns next number a person could place and the technique to find it, or None if the easy techniques
+        of the grader are not enough. A number of the player that is not in the solution is pointed out
+        first as 'mistake' with the right number. Singles come from the state the tracker keeps up to date
+        with every move, the eliminations are searched only when no single is left. Hint is kept until the
+        puzzle changes
+        """
+        tracker = self._track()
+
+        if self._hint is not None and self._hint[0] is tracker and self._hint[1] == tracker.changes:
+            return self._hint[2]
+
+        size = self.Puzzle.size
+        hint = None
+        tracker.keep_candidates()
+
+        for i, (number, right) in enumerate(zip(self.Puzzle.cells, self.solution.cells)):
+            if number and number != right:
+                hint = Hint(i // size, i % size, right, 'mistake')
+                break
+        else:
+            single = tracker.next_single()  # kept up to date by the moves
+
+            if single is not None:
+                i, number, technique = single
+                hint = Hint(i // size, i % size, number, technique)
+            else:
+                # eliminations are looked for only when no single is left, on a copy of the kept masks
+                hint = Sudoku_grader.find_hint(tracker.cands)
+
+        self._hint = (tracker, tracker.changes, hint)
+        return hint
+
+    def is_valid(self) -> bool:
+        """if the puzzle has no conflicting numbers, empty cells are allowed"""
+        return not self._track().conflicts
+
+    def _track(self) -> Tracker:
+        """
+        returns tracker of the Puzzle, tracker is rebuilt if Puzzle has been replaced.
+        History of the replaced Puzzle does not apply to the new one and is cleared
+        """
+        if not isinstance(self.Puzzle, Grid):
+            self.Puzzle = Grid.from_lists(self.Puzzle)
+        elif self.Puzzle is self.solution:
+            self.Puzzle = self.solution.copy()  # moves must not write to the solution
+
+        if self._tracker.cells is not self.Puzzle.cells:
+            self._tracker = self.Puzzle.tracker = Tracker(self.Puzzle.cells)
+            self.history.clear()
+
+        return self._tracker
+
+    # ---------------------------
+    # present
+    # ---------------------------
+
+    def present(self, grid: list):
+        """present sudoku in grid"""
+        from termcolor import colored  # imported only for the terminal game
+
+        size = len(grid)
+        box = isqrt(size)
+
+        def border(left: str, line: str, thin: str, thick: str, right: str) -> str:
+            parts = []
+            for col in range(size):
+                if col:
+                    parts.append(thick if col % box == 0 else thin)
+                parts.append(line * 3)
+
+            return f'\t{left}{"".join(parts)}{right}\n'
+
+        str_grid = '\t  ' + ' '.join(f'{col:<3}' for col in range(size)).rstrip() + '\n'
+        str_grid += border('╔', '═', '╤', '╦', '╗')
+
+        separator = border('╟', '─', '┼', '╫', '╢')
+
+        for i, y in enumerate(grid):
+
+            str_grid += f'{i:<4}║'  # starting separator
+
+            for ii, x in enumerate(y):
+                number = x
+
+                # add large or small separator for numbers
+                if ii % box == 0 and ii != 0:
+                    str_grid += '║'
+                elif ii == 0:
+                    pass
+                else:
+                    str_grid += '│'
+
+                if number != 0:
+                    symbol = SYMBOLS[number - 1]  # numbers above 9 are letters
+
+                    if (i, ii) in self.locked_coordinates:
+                        str_grid += colored(f' {symbol} ', 'red')  # add number
+                    else:
+                        str_grid += f' {symbol} '  # add number
+                else:
+                    str_grid += f'   '  # add empty space
+
+            str_grid += '║\n'  # closing separator
+
+            if i != size - 1:
+                str_grid += separator
+
+        str_grid += border('╚', '═', '╧', '╩', '╝')  # bottom of the grid
+
+        print(str_grid)
@@ -0,0 +1,215 @@
+"""
+Exact cover solver for the SUDOKU puzzle using Knuth's Dancing Links (Algorithm X).
+
+Sudoku is turned to exact cover matrix of 729 rows (every number 1 - 9 in every cell)
+and 324 columns (constraints). Every row covers exactly four columns:
+
+    0   - 80    cell (row, col) has a number
+    81  - 161   row has number n
+    162 - 242   column has number n
+    243 - 323   nonet has number n
+
+Other board sizes work the same way, 16 x 16 board has 4096 rows and 1024 columns.
+
+Links are kept in flat lists instead of node objects. The full matrix is built on first use
+and every solve works on a copy of the link lists, so the template never has to be unlinked.
+"""
+
+from functools import lru_cache
+
+from Sudoku_engine import Board, Budget, SearchResult, geometry_for
+from Sudoku_stats import Stats
+
+ROOT = 0  # header node, columns are nodes 1 - 324 on the classic board
+
+
+@lru_cache(maxsize=None)
+def _build(cells: int):
+    """builds link lists of the full exact cover matrix of the board with the given number of cells"""
+    tables = geometry_for(cells)
+    size = tables.size
+    columns_count = 4 * cells
+
+    headers = columns_count + 1
+    left = [i - 1 for i in range(headers)]
+    right = [i + 1 for i in range(headers)]
+    left[ROOT], right[columns_count] = columns_count, ROOT
+    up = list(range(headers))
+    down = list(range(headers))
+    column = list(range(headers))
+    rows_in = [0] * headers  # rows left in every column
+    candidate = [-1] * headers  # (cell, number) index of the matrix row for every node
+    first_node = []  # first node of every matrix row
+
+    for i in range(cells):
+        for number in range(1, size + 1):
+            n = number - 1
+            columns = (
+                i,
+                cells + tables.row_of[i] * size + n,
+                2 * cells + tables.col_of[i] * size + n,
+                3 * cells + tables.box_of[i] * size + n,
+            )
+
+            first = len(column)
+            first_node.append(first)
+
+            for position, col in enumerate(columns):
+                node = first + position
+                col += 1  # columns start from node 1
+
+                # link the node horizontally to the matrix row
+                left.append(first + (position - 1) % 4)
+                right.append(first + (position + 1) % 4)
+
+                # link the node vertically to the bottom of the column
+                up.append(up[col])
+                down.append(col)
+                down[up[col]] = node
+                up[col] = node
+
+                column.append(col)
+                candidate.append(i * size + n)
+                rows_in[col] += 1
+
+    return left, right, up, down, column, rows_in, candidate, first_node
+
+
+def _search(cells: list[int], limit: int, stats: Stats = None, budget: Budget = None) -> SearchResult:
+    """
+    returns number of solutions up to limit (0 counts all), the first solution and if the search was
+    complete, it is not if budget runs out. Work done is added to stats
+    """
+    if budget is not None and not budget.check():
+        return SearchResult(0, None, False)
+
+    try:
+        numbers = Board(cells).geometry.size  # possible numbers of a cell
+    except ValueError:
+        return SearchResult(0, None, True)  # duplicate numbers, no solutions
+
+    # only links and column sizes change during the search
+    left, right, up, down, column, size, candidate, first_node = _build(len(cells))
+    left, right, up, down, size = left.copy(), right.copy(), up.copy(), down.copy(), size.copy()
+
+    def cover(col):
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                up[down[j]] = up[j]
+                down[up[j]] = down[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(col):
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                up[down[j]] = j
+                down[up[j]] = j
+                j = left[j]
+            i = up[i]
+
+        right[left[col]] = col
+        left[right[col]] = col
+
+    # select matrix rows of the numbers already in the grid
+    for i, number in enumerate(cells):
+        if number:
+            node = first_node[i * numbers + number - 1]
+            for position in range(4):
+                cover(column[node + position])
+
+    selected = []
+    first = None
+    found = 0
+    nodes = backtracks = 0
+    cut = False
+
+    def search() -> bool:
+        """returns True when limit is reached or budget runs out"""
+        nonlocal found, first, nodes, backtracks, cut
+
+        if budget is not None and not budget.spend():
+            cut = True
+            return True
+
+        nodes += 1
+
+        if right[ROOT] == ROOT:
+            found += 1
+            if first is None:
+                first = list(cells)
+                for node in selected:
+                    first[candidate[node] // numbers] = candidate[node] % numbers + 1
+
+            return limit != 0 and found >= limit
+
+        # choose column with the fewest rows
+        col, best = right[ROOT], size[right[ROOT]]
+        j = right[col]
+        while j != ROOT and best > 1:
+            if size[j] < best:
+                col, best = j, size[j]
+            j = right[j]
+
+        if best == 0:
+            return False
+
+        cover(col)
+
+        i = down[col]
+        while i != col:
+            before = found
+            selected.append(i)
+            j = right[i]
+            while j != i:
+                cover(column[j])
+                j = right[j]
+
+            if search():
+                return True
+
+            if found == before:
+                backtracks += 1
+
+            selected.pop()
+            j = left[i]
+            while j != i:
+                uncover(column[j])
+                j = left[j]
+
+            i = down[i]
+
+        uncover(col)
+        return False
+
+    search()
+
+    if stats is not None:
+        stats.nodes += nodes
+        stats.backtracks += backtracks
+
+    return SearchResult(found, first, not cut)
+
+
+def search(cells: list[int], limit: int = 1, budget: Budget = None, stats: Stats = None) -> SearchResult:
+    """searches solutions of flat list of cells up to limit (0 counts all) and tells if the search finished"""
+    return _search(cells, limit, stats, budget)
+
+
+def solve(cells: list[int], stats: Stats = None, budget: Budget = None) -> list[int] | None:
+    """returns flat list of cells of the first solution or None if there is no solution or budget runs out"""
+    return _search(cells, 1, stats, budget).solution
+
+
+def count(cells: list[int], limit: int = 2, stats: Stats = None, budget: Budget = None) -> int:
+    """counts solutions of flat list of cells, stops as soon as limit solutions are found (0 counts all) or budget runs out"""
+    return _search(cells, limit, stats, budget).found
@@ -0,0 +1,1042 @@
+"""
+Constraint engine for the SUDOKU puzzle.
+
+Every cell of the 9 x 9 grid is addressed by a flat index 0 - 80 (index = row * 9 + col).
+Numbers used in a row, column and nonet are kept as bitmasks where bit n is set when
+number n is present, so checking if a number fits to a cell is a single AND operation.
+
+      0   1   2   3   4   5   6   7   8
+    ╔═══╤═══╤═══╦═══╤═══╤═══╦═══╤═══╤═══╗
+ 0  ║ 0 │ 1 │ 2 ║ 3 │ 4 │ 5 ║ 6 │ 7 │ 8 ║
+    ╟───┼───┼───╫───┼───┼───╫───┼───┼───╢
+ 1  ║ 9 │10 │11 ║12 │13 │14 ║15 │16 │17 ║
+    ╟───┼───┼───╫───┼───┼───╫───┼───┼───╢
+   ...
+
+Larger (and smaller) boards work the same way: board of n x n boxes has n² rows, columns and
+boxes and n⁴ cells, e.g. 16 x 16 for n = 4 and 25 x 25 for n = 5. Tables of every size are kept
+in a Geometry, the module constants are the tables of the classic 9 x 9 board.
+"""
+
+import time
+from functools import lru_cache, reduce
+from math import isqrt
+from operator import itemgetter, or_
+from random import Random
+from typing import NamedTuple
+
+from Sudoku_stats import Stats, phase
+
+SYMBOLS = '123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'  # numbers 1 - 35 as characters, 0 is '.'
+
+
+class Geometry:
+    """
+    Cell tables of a board made of n x n boxes, the board has n² rows, columns and boxes of n² cells.
+    Tables are made once for every size, use geometry(n) or geometry_for(cells) to get them
+    """
+
+    __slots__ = (
+        'box', 'size', 'cells', 'all_numbers', 'row_of', 'col_of', 'box_of',
+        'rows', 'cols', 'boxes', 'units', 'units_of', 'peers', 'number_of_bit', 'unit_getters', 'intersections',
+    )
+
+    def __init__(self, n: int):
+        size = n * n
+        cells = size * size
+
+        self.box = n  # rows and columns of one box
+        self.size = size  # numbers in one row, column and box
+        self.cells = cells
+        self.all_numbers = sum(1 << number for number in range(1, size + 1))
+
+        # precomputed row, column and box of every cell
+        self.row_of = tuple(i // size for i in range(cells))
+        self.col_of = tuple(i % size for i in range(cells))
+        self.box_of = tuple(self.row_of[i] // n * n + self.col_of[i] // n for i in range(cells))
+
+        # cells of every row, column and box
+        self.rows = tuple(tuple(range(row * size, row * size + size)) for row in range(size))
+        self.cols = tuple(tuple(range(col, cells, size)) for col in range(size))
+        boxes = [[] for _ in range(size)]
+        for i in range(cells):
+            boxes[self.box_of[i]].append(i)
+        self.boxes = tuple(map(tuple, boxes))
+        self.units = self.rows + self.cols + self.boxes
+
+        # indexes in units of the row, column and box of every cell
+        self.units_of = tuple((self.row_of[i], size + self.col_of[i], 2 * size + self.box_of[i]) for i in range(cells))
+
+        # cells that share a row, column or box with the cell
+        self.peers = tuple(
+            tuple(sorted(set(self.rows[self.row_of[i]] + self.cols[self.col_of[i]] + self.boxes[self.box_of[i]]) - {i}))
+            for i in range(cells)
+        )
+
+        # number for every single bit mask, e.g. 0b100 -> 2
+        self.number_of_bit = {1 << number: number for number in range(1, size + 1)}
+
+        # getters of the values of every unit from a flat list, used by the deduction in the search
+        self.unit_getters = tuple((unit, _getter(unit)) for unit in self.units)
+
+        # every box and row or column that cross as getters of the cells in both, rest of the box and
+        # rest of the line, together with the cells of the rests. Used by the box/line reductions
+        intersections = []
+        for box in self.boxes if n > 1 else ():
+            for line in [self.rows[self.row_of[i]] for i in box[::n]] + [self.cols[self.col_of[i]] for i in box[:n]]:
+                segment = [i for i in box if i in line]
+                box_rest = [i for i in box if i not in line]
+                line_rest = [i for i in line if i not in box]
+                intersections.append(
+                    (_getter(segment), _getter(box_rest), tuple(box_rest), _getter(line_rest), tuple(line_rest))
+                )
+        self.intersections = tuple(intersections)
+
+    def __repr__(self) -> str:
+        return f'Geometry({self.box})'
+
+
+def _getter(cells):
+    """returns function that takes values of the cells from a flat list as tuple"""
+    if len(cells) == 1:
+        i = cells[0]
+        return lambda values: (values[i],)
+
+    return itemgetter(*cells)
+
+
+@lru_cache(maxsize=None)
+def geometry(n: int = 3) -> Geometry:
+    """returns tables of the board with n x n boxes, 3 is the classic 9 x 9 board"""
+    if n < 1:
+        raise ValueError(f'Box size must be at least 1, got {n}')
+
+    return Geometry(n)
+
+
+def geometry_for(cells: int) -> Geometry:
+    """returns tables of the board that has the given number of cells, raises ValueError if there is none"""
+    n = isqrt(isqrt(cells))
+
+    if n < 1 or n ** 4 != cells:
+        raise ValueError(f'No board has {cells} cells, boards have n⁴ cells (16, 81, 256, 625, ...)')
+
+    return geometry(n)
+
+
+# tables of the classic 9 x 9 board
+CLASSIC = geometry(3)
+SIZE = CLASSIC.size  # numbers in one row, column and nonet
+CELLS = CLASSIC.cells
+ALL_NUMBERS = CLASSIC.all_numbers  # bits 1 - 9 set
+ROW_OF, COL_OF, BOX_OF = CLASSIC.row_of, CLASSIC.col_of, CLASSIC.box_of
+ROWS, COLS, BOXES, UNITS = CLASSIC.rows, CLASSIC.cols, CLASSIC.boxes, CLASSIC.units
+UNITS_OF = CLASSIC.units_of
+PEERS = CLASSIC.peers  # the 20 cells that share a row, column or nonet with the cell
+NUMBER_OF_BIT = CLASSIC.number_of_bit
+
+
+def numbers_in(mask: int) -> list[int]:
+    """returns numbers which bits are set in mask"""
+    numbers = []
+    while mask:
+        bit = mask & -mask
+        numbers.append(bit.bit_length() - 1)
+        mask ^= bit
+
+    return numbers
+
+
+def flatten(grid) -> list[int]:
+    """turns nested grid, e.g. 9 x 9, to flat list of its cells"""
+    return [number for row in grid for number in row]
+
+
+class Board:
+    """
+    Incremental row, column and box bitmasks on top of a flat list of cells, 81 for the classic board.
+    place() and remove() keep the masks up to date so every check is O(1).
+    Size of the board is taken from the cells, or from geometry for an empty board
+    """
+
+    __slots__ = ('cells', 'rows', 'cols', 'boxes', 'geometry', 'row_of', 'col_of', 'box_of')
+
+    def __init__(self, cells=None, geometry: Geometry = None):
+        if geometry is None:
+            geometry = CLASSIC if cells is None else geometry_for(len(cells))
+
+        size = geometry.size
+        self.geometry = geometry
+        self.row_of, self.col_of, self.box_of = geometry.row_of, geometry.col_of, geometry.box_of
+        self.cells = [0] * geometry.cells
+        self.rows = [0] * size
+        self.cols = [0] * size
+        self.boxes = [0] * size
+
+        if cells is not None:
+            if len(cells) != geometry.cells:
+                raise ValueError(f'Board must have {geometry.cells} cells, got {len(cells)}')
+
+            for i, number in enumerate(cells):
+                if number == 0:
+                    continue
+
+                if not 0 < number <= size:
+                    raise ValueError(f'Number {number} out of range at row {self.row_of[i]}, col {self.col_of[i]}')
+
+                if not self.can_place(i, number):
+                    raise ValueError(f'Duplicate value {number} at row {self.row_of[i]}, col {self.col_of[i]}')
+
+                self.place(i, number)
+
+    @classmethod
+    def from_grid(cls, grid: list[list]) -> 'Board':
+        """makes board from nested grid, e.g. 9 x 9, raises ValueError if the grid has duplicates"""
+        return cls(flatten(grid))
+
+    def to_grid(self) -> list[list]:
+        """returns board as nested grid, e.g. 9 x 9"""
+        cells = self.cells
+        size = self.geometry.size
+        return [cells[row * size:row * size + size] for row in range(size)]
+
+    def used(self, i: int) -> int:
+        """mask of numbers that are already used by peers of the cell"""
+        return self.rows[self.row_of[i]] | self.cols[self.col_of[i]] | self.boxes[self.box_of[i]]
+
+    def candidates(self, i: int) -> int:
+        """mask of numbers that can be placed to the cell"""
+        return self.geometry.all_numbers & ~self.used(i)
+
+    def can_place(self, i: int, number: int) -> bool:
+        """if number can be placed to the cell"""
+        return not self.used(i) & (1 << number)
+
+    def place(self, i: int, number: int):
+        """places number to the cell, cell must be empty"""
+        bit = 1 << number
+        self.cells[i] = number
+        self.rows[self.row_of[i]] |= bit
+        self.cols[self.col_of[i]] |= bit
+        self.boxes[self.box_of[i]] |= bit
+
+    def remove(self, i: int) -> int:
+        """removes number from the cell and returns it"""
+        number = self.cells[i]
+        if number:
+            bit = ~(1 << number)
+            self.cells[i] = 0
+            self.rows[self.row_of[i]] &= bit
+            self.cols[self.col_of[i]] &= bit
+            self.boxes[self.box_of[i]] &= bit
+
+        return number
+
+    def empty_cells(self) -> list[int]:
+        """returns indexes of all empty cells"""
+        return [i for i, number in enumerate(self.cells) if number == 0]
+
+
+class Tracker:
+    """
+    Counts every number in every row, column and nonet of a grid that is allowed to have duplicates,
+    like the puzzle the player is filling. Cells that share their number with a peer are kept in
+    conflicts, so every move and every conflict query is O(1) and the board is never rescanned.
+    Numbers used in every unit are kept as bit masks too, so candidates of a cell are O(1) as well.
+    After keep_candidates the candidate masks, cells with one candidate and the places left for every
+    number in every unit are kept up to date by every move, so singles are found without a scan.
+    """
+
+    __slots__ = ('cells', 'counts', 'used', 'conflicts', 'changes', 'geometry', 'stride',
+                 'cands', 'places', 'singles', 'hidden')
+
+    def __init__(self, cells):
+        self.cells = cells  # shared with the owner, e.g. bytearray of the Grid
+        self.geometry = geometry_for(len(cells))
+        self.stride = self.geometry.size + 1
+        self.counts = [0] * (3 * self.geometry.size * self.stride)  # unit * stride + number
+        self.used = [0] * (3 * self.geometry.size)  # bits of the numbers in every unit
+        self.conflicts = {}  # cell -> number of its units where its number is duplicated
+        self.changes = 0  # cells changed so far, tells owners if what they derived from the cells is stale
+
+        # kept only after keep_candidates, moves of a tracker nobody asks hints from stay cheap
+        self.cands = None  # candidate mask of every cell, 0 for filled cells
+        self.places = None  # unit * stride + number -> cells of the unit where number is a candidate
+        self.singles = None  # cells that have one candidate
+        self.hidden = None  # unit * stride + number that has one place left in the unit
+
+        for i, number in enumerate(cells):
+            if number:
+                cells[i] = 0
+                self.set(i, number)
+
+    def set(self, i: int, number: int):
+        """writes number to the cell, 0 clears the cell. Raises ValueError if number is not 0 - size"""
+        if not 0 <= number <= self.geometry.size:
+            raise ValueError(f'Number must be 0 - {self.geometry.size}, got {number}')
+
+        old = self.cells[i]
+        if old == number:
+            return
+
+        if old:
+            self._remove(i, old)
+        if number:
+            self._add(i, number)
+
+        self.cells[i] = number
+        self.changes += 1
+
+        if self.cands is not None:
+            self._update_candidates(i)
+
+    def _add(self, i: int, number: int):
+        for unit in self.geometry.units_of[i]:
+            key = unit * self.stride + number
+            self.counts[key] += 1
+
+            if self.counts[key] == 1:
+                self.used[unit] |= 1 << number
+            elif self.counts[key] == 2:
+                # the number that was alone in the unit is now a duplicate too
+                for j in self.geometry.units[unit]:
+                    if j != i and self.cells[j] == number:
+                        self._mark(j, 1)
+
+            if self.counts[key] >= 2:
+                self._mark(i, 1)
+
+    def _remove(self, i: int, number: int):
+        for unit in self.geometry.units_of[i]:
+            key = unit * self.stride + number
+
+            if self.counts[key] >= 2:
+                self._mark(i, -1)
+
+            self.counts[key] -= 1
+
+            if self.counts[key] == 0:
+                self.used[unit] &= ~(1 << number)
+            elif self.counts[key] == 1:
+                # the number left in the unit is not a duplicate anymore
+                for j in self.geometry.units[unit]:
+                    if j != i and self.cells[j] == number:
+                        self._mark(j, -1)
+
+    def _mark(self, i: int, change: int):
+        conflicts = self.conflicts.get(i, 0) + change
+
+        if conflicts:
+            self.conflicts[i] = conflicts
+        else:
+            del self.conflicts[i]
+
+    def conflicting(self, i: int, number: int) -> bool:
+        """if number would share a row, column or nonet with the same number in another cell"""
+        counts = self.counts
+        own = self.cells[i] == number
+
+        return any(counts[unit * self.stride + number] > own for unit in self.geometry.units_of[i])
+
+    def candidates(self, i: int) -> int:
+        """returns mask of the numbers that fit to the empty cell without a duplicate, 0 for a filled cell"""
+        if self.cells[i]:
+            return 0
+
+        row, col, box = self.geometry.units_of[i]
+        used = self.used
+        return self.geometry.all_numbers & ~(used[row] | used[col] | used[box])
+
+    def keep_candidates(self):
+        """starts keeping candidate masks, singles and places of the numbers up to date, does nothing if it is already"""
+        if self.cands is not None:
+            return
+
+        self.cands = self.masks()
+        self.places = [0] * len(self.counts)
+        self.singles = set()
+        self.hidden = set()
+
+        for i, mask in enumerate(self.cands):
+            self._count_places(i, 0, mask)
+
+    def _update_candidates(self, i: int):
+        """updates candidates of the cell and its peers after a move in the cell"""
+        cells, cands, used = self.cells, self.cands, self.used
+        all_numbers = self.geometry.all_numbers
+        units_of = self.geometry.units_of
+
+        for j in (i, *self.geometry.peers[i]):
+            if cells[j]:
+                mask = 0
+            else:
+                row, col, box = units_of[j]
+                mask = all_numbers & ~(used[row] | used[col] | used[box])
+
+            if mask != cands[j]:
+                self._count_places(j, cands[j], mask)
+                cands[j] = mask
+
+    def _count_places(self, i: int, old: int, new: int):
+        """moves the cell from old to new candidate mask in singles and places of its units"""
+        if new and not new & (new - 1):
+            self.singles.add(i)
+        else:
+            self.singles.discard(i)
+
+        places, hidden, stride = self.places, self.hidden, self.stride
+        changed = old ^ new
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            change = 1 if new & bit else -1
+            number = bit.bit_length() - 1
+
+            for unit in self.geometry.units_of[i]:
+                key = unit * stride + number
+                places[key] += change
+
+                if places[key] == 1:
+                    hidden.add(key)
+                else:
+                    hidden.discard(key)
+
+    def next_single(self) -> tuple[int, int, str] | None:
+        """
+        returns (cell, number, technique) of a naked or hidden single from the kept state, the same the
+        Logic techniques would find first, or None if there is none. keep_candidates must have been called
+        """
+        if self.singles:
+            i = min(self.singles)
+            return i, self.cands[i].bit_length() - 1, 'naked single'
+
+        if self.hidden:
+            unit, number = divmod(min(self.hidden), self.stride)
+            bit = 1 << number
+            for i in self.geometry.units[unit]:
+                if self.cands[i] & bit:
+                    return i, number, 'hidden single'
+
+        return None
+
+    def masks(self) -> list[int]:
+        """returns candidate mask of every cell, filled cells have mask 0, as the techniques of the Logic use"""
+        used = self.used
+        all_numbers = self.geometry.all_numbers
+
+        return [
+            0 if number else all_numbers & ~(used[row] | used[col] | used[box])
+            for number, (row, col, box) in zip(self.cells, self.geometry.units_of)
+        ]
+
+
+def fits(grid, row: int, col: int, number: int) -> bool:
+    """if number can be put to nested grid in row, col location without duplicates in its peers"""
+    if number == 0:
+        return True
+
+    tables = geometry_for(len(grid) ** 2)
+    for i in tables.peers[row * tables.size + col]:
+        if grid[tables.row_of[i]][tables.col_of[i]] == number:
+            return False
+
+    return True
+
+
+# ---------------------------
+# Search
+# ---------------------------
+
+class Budget:
+    """
+    Limits of solve and generate calls: number of search nodes (0 no limit), wall clock seconds and
+    a cancel token, threading.Event or anything with is_set(). Limits are shared by all calls the
+    budget is given to. Clock and token are looked at every CHECK_EVERY nodes.
+    After the calls exhausted is None if they finished, or 'nodes', 'deadline' or 'cancelled'
+    if they were cut off
+    """
+
+    __slots__ = ('max_nodes', 'deadline', 'cancel', 'nodes', 'exhausted')
+
+    CHECK_EVERY = 64  # power of two
+
+    def __init__(self, max_nodes: int = 0, seconds: float = None, cancel=None):
+        self.max_nodes = max_nodes
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.cancel = cancel
+        self.nodes = 0  # nodes spent so far
+        self.exhausted = None
+
+    def spend(self) -> bool:
+        """takes one node from the budget, returns False if the budget has run out"""
+        if self.exhausted is not None:
+            return False
+
+        if self.max_nodes and self.nodes >= self.max_nodes:
+            self.exhausted = 'nodes'
+            return False
+
+        self.nodes += 1
+        if self.nodes & (self.CHECK_EVERY - 1) == 0:
+            return self.check()
+
+        return True
+
+    def check(self) -> bool:
+        """looks at the clock and cancel token now, returns False if the budget has run out"""
+        if self.exhausted is None:
+            if self.cancel is not None and self.cancel.is_set():
+                self.exhausted = 'cancelled'
+            elif self.deadline is not None and time.monotonic() >= self.deadline:
+                self.exhausted = 'deadline'
+
+        return self.exhausted is None
+
+    def __repr__(self) -> str:
+        return f'Budget(max_nodes={self.max_nodes}, nodes={self.nodes}, exhausted={self.exhausted!r})'
+
+
+class SearchResult(NamedTuple):
+    found: int  # solutions found, up to the limit
+    solution: list[int] | None  # first solution
+    complete: bool  # False if the search was cut off, then found is only a lower bound
+    deduced: int = 0  # empty cells filled by deduction alone, before any guess
+
+
+def fill(board: Board, shuffle, stats: Stats = None, budget: Budget = None) -> bool:
+    """
+    fills empty cells of the board with backtracking in cell order, numbers are tried in order given by shuffle.
+    Fast for the classic board, use random_fill for larger boards.
+    Returns False and leaves board unchanged if there is no solution or budget runs out.
+    Singles and box/line reductions are left out on purpose: every node draws one shuffle, so pruning
+    nodes would change the solution, and the puzzle, of every seed that has been handed out
+    (SUDOKU(seed=ID), stored seeds). Fill is about a fifth of a 9 x 9 generate, ~130 nodes
+    """
+    # a cancel token set or deadline passed before the call is seen before the first node
+    if budget is not None and not budget.check():
+        return False
+
+    empty = board.empty_cells()
+    number_list = list(range(1, board.geometry.size + 1))
+    nodes = backtracks = 0
+
+    def _fill(position: int) -> bool:
+        nonlocal nodes, backtracks
+
+        if position == len(empty):
+            return True
+
+        if budget is not None and not budget.spend():
+            return False
+
+        nodes += 1
+        i = empty[position]
+        shuffle(number_list)  # if not shuffled same solution would be generated always
+
+        for number in [number for number in number_list if board.can_place(i, number)]:
+            board.place(i, number)
+
+            if _fill(position + 1):
+                return True
+
+            board.remove(i)
+
+            if budget is not None and budget.exhausted:
+                return False
+
+            backtracks += 1
+
+        return False
+
+    filled = _fill(0)
+
+    if stats is not None:
+        stats.nodes += nodes
+        stats.backtracks += backtracks
+        stats.checks += nodes * len(number_list)  # every number is checked once in every node
+
+    return filled
+
+
+def pattern_fill(board: Board, rng: Random):
+    """
+    fills empty board with a valid pattern and shuffles its digits, bands, stacks and the rows and
+    columns inside them. Takes always the same time, no matter how large the board is
+    """
+    n = board.geometry.box
+    size = board.geometry.size
+
+    def lines() -> list[int]:
+        bands = list(range(n))
+        rng.shuffle(bands)
+
+        order = []
+        for band in bands:
+            inner = list(range(band * n, band * n + n))
+            rng.shuffle(inner)
+            order += inner
+
+        return order
+
+    digits = list(range(1, size + 1))
+    rng.shuffle(digits)
+    rows, cols = lines(), lines()
+
+    for row in range(size):
+        for col in range(size):
+            # pattern of the base grid, every row is the one above shifted by n (or n + 1 at band change)
+            number = digits[(n * (rows[row] % n) + rows[row] // n + cols[col]) % size]
+            board.place(row * size + col, number)
+
+
+def random_fill(board: Board, rng: Random, max_nodes: int = 0, stats: Stats = None, budget: Budget = None) -> bool:
+    """
+    fills empty cells of the board with a random solution found by the search, which scales to large boards.
+    Returns False and leaves board unchanged if there is no solution or max_nodes (0 no limit) or budget runs out
+    """
+    first = _search(board, 1, max_nodes, rng.shuffle, stats, budget).solution
+    if first is None:
+        return False
+
+    for i, number in enumerate(first):
+        if not board.cells[i]:
+            board.place(i, number)
+
+    return True
+
+
+def _place(cells: list[int], masks: list[int], peers: tuple, i: int, bit: int, singles: list[int]) -> bool:
+    """
+    fills the cell with the number of bit and removes it from the candidates of the peers, peers left
+    with one candidate are added to singles. Returns False if a peer is left without candidates
+    """
+    cells[i] = bit.bit_length() - 1
+    masks[i] = 0
+
+    for peer in peers:
+        mask = masks[peer]
+        if mask & bit:
+            mask ^= bit
+            masks[peer] = mask
+
+            if not mask & (mask - 1):
+                if not mask:
+                    return False
+
+                singles.append(peer)
+
+    return True
+
+
+def _propagate(cells: list[int], masks: list[int], tables: Geometry, singles: list[int], stats: Stats = None,
+               reductions: bool = True) -> bool:
+    """
+    fills naked singles, starting from the cells in singles, and hidden singles and removes candidates
+    with box/line reductions if reductions is set, until none of them makes progress. Cells and
+    candidate masks are changed in place, filled cells have mask 0.
+    Returns False if a cell or a number of a unit has no place left.
+    Candidate masks looked at are added to stats.checks
+    """
+    peers = tables.peers
+    empty = cells.count(0) if stats is not None else 0
+
+    try:
+        while True:
+            # naked singles, cell with one candidate left
+            while singles:
+                i = singles.pop()
+                mask = masks[i]
+                if mask and not _place(cells, masks, peers[i], i, mask, singles):
+                    return False
+
+            if 0 not in cells:
+                return True
+
+            # hidden singles, number that has only one cell left in a unit
+            for unit, values in tables.unit_getters:
+                once = twice = 0
+                for mask in values(masks):
+                    twice |= once & mask
+                    once |= mask
+
+                # numbers missing from the unit are as many as its empty cells, all of them need a place
+                if once.bit_count() != values(cells).count(0):
+                    return False
+
+                single = once & ~twice
+                while single:
+                    bit = single & -single
+                    single ^= bit
+
+                    for i in unit:
+                        if masks[i] & bit:
+                            if not _place(cells, masks, peers[i], i, bit, singles):
+                                return False
+                            break
+
+            if singles:
+                continue
+
+            if not reductions:
+                return True
+
+            # box/line reductions, number of a line that is only inside one box cannot be elsewhere in the
+            # box, and number of a box that is only on one line cannot be elsewhere on the line
+            reduced = False
+            for segment, box_rest, box_cells, line_rest, line_cells in tables.intersections:
+                inside = reduce(or_, segment(masks))
+                if not inside:
+                    continue
+
+                only_box = inside & ~reduce(or_, box_rest(masks))  # numbers of the box only on this line
+                only_line = inside & ~reduce(or_, line_rest(masks))  # numbers of the line only in this box
+
+                for bits, rest in ((only_line, box_cells), (only_box, line_cells)):
+                    if bits:
+                        for i in rest:
+                            mask = masks[i]
+                            if mask & bits:
+                                mask &= ~bits
+                                masks[i] = mask
+                                reduced = True
+
+                                if not mask & (mask - 1):
+                                    if not mask:
+                                        return False
+
+                                    singles.append(i)
+
+            if not reduced:
+                return True
+    finally:
+        if stats is not None:
+            # every filled cell looked at the masks of its peers
+            stats.checks += (empty - cells.count(0)) * len(peers[0])
+
+
+def _search(board: Board, limit: int, max_nodes: int = 0, shuffle=None, stats: Stats = None,
+            budget: Budget = None) -> SearchResult:
+    """
+    returns number of solutions up to limit (0 counts all), the first solution, if the search was complete
+    and how many empty cells were filled by deduction before the first guess.
+    Every node fills what it can by deduction first and then branches on the cell with the fewest candidates,
+    in order given by shuffle if set. Search gives up after max_nodes branches (0 no limit) of
+    this search or when budget runs out. Board is left unchanged
+    """
+    if budget is not None and not budget.check():
+        return SearchResult(0, None, False)
+
+    tables = board.geometry
+    found = 0
+    first = None
+    nodes = backtracks = 0
+    cut = False
+
+    def _branch(cells: list[int], masks: list[int]):
+        nonlocal found, first, nodes, backtracks, cut
+
+        nodes += 1
+        if max_nodes and nodes > max_nodes or budget is not None and not budget.spend():
+            cut = True
+            return
+
+        # the cell with the fewest candidates has the fewest branches
+        best, best_count = -1, tables.size + 1
+        for i, mask in enumerate(masks):
+            if mask:
+                count = mask.bit_count()
+                if count < best_count:
+                    best, best_count = i, count
+                    if count == 2:
+                        break
+
+        if best == -1:
+            found += 1
+            if first is None:
+                first = cells
+            return
+
+        numbers = numbers_in(masks[best])
+        if shuffle is not None:
+            shuffle(numbers)
+
+        peers = tables.peers[best]
+        for number in numbers:
+            before = found
+
+            # box/line reductions are left to the root, they cost more than they save in the branches
+            new_cells, new_masks, singles = cells.copy(), masks.copy(), []
+            if (_place(new_cells, new_masks, peers, best, 1 << number, singles)
+                    and _propagate(new_cells, new_masks, tables, singles, stats, reductions=False)):
+                _branch(new_cells, new_masks)
+
+            if cut or (limit and found >= limit):
+                break
+
+            if found == before:
+                backtracks += 1
+
+    cells = board.cells.copy()
+    masks = candidate_masks(board)
+    empty = cells.count(0)
+
+    # root is deduced here, so the cells filled by deduction alone can be counted
+    deduced = 0
+    if all(masks[i] for i, number in enumerate(cells) if not number):
+        singles = [i for i, mask in enumerate(masks) if mask and not mask & (mask - 1)]
+        if _propagate(cells, masks, tables, singles, stats):
+            deduced = empty - cells.count(0)
+            _branch(cells, masks)
+
+    if stats is not None:
+        stats.nodes += nodes - cut  # node that was cut off was not visited
+        stats.backtracks += backtracks
+        stats.deduced += deduced
+
+    return SearchResult(found, first, not cut, deduced)
+
+
+def search(board: Board, limit: int = 1, budget: Budget = None, stats: Stats = None) -> SearchResult:
+    """
+    searches solutions of the board up to limit (0 counts all) and tells if the search finished,
+    use it instead of solve and count_solutions when budget can cut the search off
+    """
+    return _search(board, limit, stats=stats, budget=budget)
+
+
+def count_solutions(board: Board, limit: int = 2, max_nodes: int = 0, stats: Stats = None,
+                    budget: Budget = None) -> int:
+    """
+    counts solutions of the board, stops as soon as limit solutions are found (0 counts all).
+    If max_nodes (0 no limit) or budget runs out, solutions found so far are returned
+    """
+    return _search(board, limit, max_nodes, stats=stats, budget=budget).found
+
+
+def is_unique(board: Board, max_nodes: int = 0, stats: Stats = None, budget: Budget = None) -> bool:
+    """if the board has exactly one solution, False also when max_nodes (0 no limit) or budget runs out before it is proven"""
+    result = _search(board, 2, max_nodes, stats=stats, budget=budget)
+    return result.complete and result.found == 1
+
+
+def solve(board: Board, stats: Stats = None, budget: Budget = None) -> list[int] | None:
+    """returns flat list of cells of the first solution or None if there is no solution or budget runs out"""
+    return _search(board, 1, stats=stats, budget=budget).solution
+
+
+def remove_numbers(board: Board, shuffle, rounds: int = 3, min_clues: int = 17, max_nodes: int = 0,
+                   stats: Stats = None, budget: Budget = None):
+    """
+    removes numbers from the board in order given by shuffle as long as the board has only one solution.
+    Stops after rounds failed removals or when the board has min_clues numbers left.
+    Uniqueness check gives up after max_nodes branches (0 no limit), and the number is put back.
+    If budget runs out, the number is put back and removing stops, so the board stays unique
+    """
+    squares = [i for i, number in enumerate(board.cells) if number != 0]
+    shuffle(squares)
+    clues = len(squares)
+
+    while rounds > 0 and clues >= min_clues and squares:
+        i = squares.pop()
+        clues -= 1
+
+        # might need to put the number back if there is more than one solution
+        number = board.remove(i)
+
+        if stats is not None:
+            stats.unique_checks += 1
+
+        with phase(stats, 'verify'):
+            unique = is_unique(board, max_nodes, stats, budget)
+
+        if not unique:
+            board.place(i, number)
+            clues += 1
+            rounds -= 1
+
+            if budget is not None and budget.exhausted:
+                return
+
+
+# generation settings of the other board sizes, searches are capped so generation time stays bounded
+FILL_TRIES = 3
+FILL_MAX_NODES = 2000
+REMOVE_ROUNDS = 20
+REMOVE_MAX_NODES = 50
+
+
+def generate(seed: int, n: int = 3, stats: Stats = None, budget: Budget = None) -> tuple[list[int], list[int]]:
+    """
+    generates puzzle and its solution as flat lists of cells for the board of n x n boxes,
+    same seed and n give always the same puzzle. Work done is counted to stats if given.
+    If budget runs out while numbers are removed, the puzzle is returned as it is, it has one
+    solution but more numbers than it would have had, budget.exhausted tells if that happened.
+    Raises ValueError if budget runs out before the solution is filled, no puzzle can be formed then
+    """
+    rng = Random(seed)
+    board = Board(geometry=geometry(n))
+
+    if n == 3:
+        with phase(stats, 'fill'):
+            if not fill(board, rng.shuffle, stats, budget):
+                raise ValueError(f'Budget ran out ({budget.exhausted}) before the solution was filled')
+
+        solution = board.cells.copy()
+
+        with phase(stats, 'remove'):
+            remove_numbers(board, rng.shuffle, stats=stats, budget=budget)
+
+        return board.cells, solution
+
+    # backtracking in cell order does not finish on large boards, random search is tried a few
+    # times and if it runs out of nodes the shuffled pattern is used
+    with phase(stats, 'fill'):
+        for _ in range(FILL_TRIES):
+            if random_fill(board, rng, FILL_MAX_NODES, stats, budget):
+                break
+
+            if budget is not None and budget.exhausted:
+                raise ValueError(f'Budget ran out ({budget.exhausted}) before the solution was filled')
+        else:
+            pattern_fill(board, rng)
+
+    solution = board.cells.copy()
+
+    with phase(stats, 'remove'):
+        remove_numbers(board, rng.shuffle, REMOVE_ROUNDS, min_clues=0, max_nodes=REMOVE_MAX_NODES, stats=stats,
+                       budget=budget)
+
+    return board.cells, solution
+
+
+def to_string(cells: list[int]) -> str:
+    """turns flat list of cells to a string of one character each, numbers above 9 are letters and empty cells '.'"""
+    return ''.join(SYMBOLS[number - 1] if number else '.' for number in cells)
+
+
+def from_string(text: str) -> list[int]:
+    """turns string of 81 (or 16, 256, 625) characters to flat list of cells, empty cells can be '.' or '0'"""
+    text = text.strip()
+
+    if len(text) != CELLS:
+        try:
+            geometry_for(len(text))
+        except ValueError:
+            raise ValueError(f'Puzzle must have {CELLS} characters, got {len(text)}') from None
+
+    try:
+        return [0 if char in '.0' else SYMBOLS.index(char.upper()) + 1 for char in text]
+    except ValueError:
+        raise ValueError(f'Puzzle has unknown characters, use {SYMBOLS} or . and 0 for empty cells') from None
+
+
+# ---------------------------
+# Logic
+# ---------------------------
+# human solving techniques, they work on candidate masks of the cells where filled cells have mask 0.
+# Placements return (cell, number) and eliminations return list of (cell, bits to remove) or None
+
+def candidate_masks(board: Board) -> list[int]:
+    """returns candidate mask of every cell of the board"""
+    rows, cols, boxes = board.rows, board.cols, board.boxes
+    all_numbers = board.geometry.all_numbers
+
+    return [
+        0 if number else all_numbers & ~(rows[row] | cols[col] | boxes[box])
+        for number, row, col, box in zip(board.cells, board.row_of, board.col_of, board.box_of)
+    ]
+
+
+def assign(cells: list[int], masks: list[int], i: int, number: int):
+    """places number to the cell and removes it from the candidates of the peers"""
+    cells[i] = number
+    masks[i] = 0
+
+    bit = ~(1 << number)
+    for peer in geometry_for(len(masks)).peers[i]:
+        masks[peer] &= bit
+
+
+def naked_single(masks: list[int]) -> tuple[int, int] | None:
+    """cell that has only one candidate left"""
+    for i, mask in enumerate(masks):
+        if mask and not mask & (mask - 1):
+            return i, mask.bit_length() - 1
+
+    return None
+
+
+def hidden_single(masks: list[int]) -> tuple[int, int] | None:
+    """number that fits to only one cell of a row, column or box"""
+    for unit in geometry_for(len(masks)).units:
+        # numbers seen once and more than once in the unit
+        once = twice = 0
+        for i in unit:
+            twice |= once & masks[i]
+            once |= masks[i]
+
+        single = once & ~twice
+        if single:
+            bit = single & -single
+            for i in unit:
+                if masks[i] & bit:
+                    return i, bit.bit_length() - 1
+
+    return None
+
+
+def pointing(masks: list[int]) -> list[tuple[int, int]] | None:
+    """
+    number that is inside one box only on one row or column can be removed from the rest of the line,
+    and number that is inside one line only in one box can be removed from the rest of the box
+    """
+    tables = geometry_for(len(masks))
+    box_of = tables.box_of
+
+    for box in tables.boxes:
+        for lines, line_of in ((tables.rows, tables.row_of), (tables.cols, tables.col_of)):
+            for number in range(1, tables.size + 1):
+                bit = 1 << number
+                found = {line_of[i] for i in box if masks[i] & bit}
+
+                if len(found) == 1:
+                    line = lines[found.pop()]
+                    eliminations = [(i, bit) for i in line if masks[i] & bit and box_of[i] != box_of[box[0]]]
+                    if eliminations:
+                        return eliminations
+
+    for line in tables.rows + tables.cols:
+        for number in range(1, tables.size + 1):
+            bit = 1 << number
+            found = {box_of[i] for i in line if masks[i] & bit}
+
+            if len(found) == 1:
+                box = tables.boxes[found.pop()]
+                eliminations = [(i, bit) for i in box if masks[i] & bit and i not in line]
+                if eliminations:
+                    return eliminations
+
+    return None
+
+
+def naked_pair(masks: list[int]) -> list[tuple[int, int]] | None:
+    """two cells of a unit with the same two candidates, the candidates can be removed from the rest of the unit"""
+    for unit in geometry_for(len(masks)).units:
+        pairs = {}
+        for i in unit:
+            mask = masks[i]
+            if mask.bit_count() != 2:
+                continue
+
+            if mask in pairs:
+                eliminations = [(j, mask & masks[j]) for j in unit if j not in (i, pairs[mask]) and mask & masks[j]]
+                if eliminations:
+                    return eliminations
+            else:
+                pairs[mask] = i
+
+    return None
+
+
+PLACEMENTS = (('naked single', naked_single), ('hidden single', hidden_single))
+ELIMINATIONS = (('pointing', pointing), ('naked pair', naked_pair))
@@ -0,0 +1,175 @@
+"""
+Difficulty grader for SUDOKU puzzles and difficulty-targeted puzzle generation.
+
+Puzzle is solved like a person would do it: the easiest technique that makes progress is
+always used next. Every use of a technique adds its weight to the score, and the hardest
+technique needed decides the level together with the score.
+
+    easy     singles only, mostly naked singles
+    medium   singles only, many hidden singles
+    hard     needs pointing or naked pairs
+    expert   cannot be solved with these techniques, needs guessing
+"""
+
+from random import Random
+from typing import NamedTuple
+
+from Sudoku_engine import (
+    Board, Budget, ELIMINATIONS, PLACEMENTS, assign, candidate_masks, fill, geometry_for, search,
+)
+from Sudoku_stats import Stats, phase
+
+LEVELS = ('easy', 'medium', 'hard', 'expert')
+WEIGHTS = {'naked single': 1, 'hidden single': 2, 'pointing': 5, 'naked pair': 8}
+EASY_MAX_SCORE = 60  # singles-only puzzles above this score are medium
+
+
+class Grade(NamedTuple):
+    level: str
+    score: int
+    solved: bool  # if techniques were enough to solve the puzzle
+    techniques: dict  # number of uses of every technique
+
+
+def grade(cells: list[int]) -> Grade:
+    """grades puzzle given as flat list of 81 cells, raises ValueError if the puzzle has duplicates"""
+    cells = Board(cells).cells
+    masks = candidate_masks(Board(cells))
+    used = dict.fromkeys(WEIGHTS, 0)
+
+    while 0 in cells:
+        for name, find in PLACEMENTS:
+            step = find(masks)
+            if step is not None:
+                assign(cells, masks, *step)
+                break
+        else:
+            for name, find in ELIMINATIONS:
+                eliminations = find(masks)
+                if eliminations is not None:
+                    for i, bits in eliminations:
+                        masks[i] &= ~bits
+                    break
+            else:
+                break  # no technique makes progress
+
+        used[name] += 1
+
+    solved = 0 not in cells
+    score = sum(WEIGHTS[name] * count for name, count in used.items())
+
+    if not solved:
+        level = 'expert'
+    elif used['pointing'] or used['naked pair']:
+        level = 'hard'
+    elif score > EASY_MAX_SCORE:
+        level = 'medium'
+    else:
+        level = 'easy'
+
+    return Grade(level, score, solved, used)
+
+
+class Hint(NamedTuple):
+    row: int
+    col: int
+    number: int
+    technique: str  # technique that places the number, or 'mistake' if the number in the cell is wrong
+    after: tuple = ()  # eliminations that had to be made first, in order
+
+
+def find_hint(masks: list[int]) -> Hint | None:
+    """
+    returns next placement a person would find in the candidate masks, with the easiest technique first,
+    or None if these techniques are not enough. Masks are not changed
+    """
+    masks = masks.copy()
+    size = geometry_for(len(masks)).size
+    after = []
+
+    while True:
+        for name, find in PLACEMENTS:
+            step = find(masks)
+            if step is not None:
+                i, number = step
+                return Hint(i // size, i % size, number, name, tuple(after))
+
+        for name, find in ELIMINATIONS:
+            eliminations = find(masks)
+            if eliminations is not None:
+                for i, bits in eliminations:
+                    masks[i] &= ~bits
+
+                after.append(name)
+                break
+        else:
+            return None  # no technique makes progress
+
+
+def generate(seed: int, difficulty: str, orders: int = 5, grids: int = 4, stats: Stats = None,
+             budget: Budget = None) -> tuple[list[int], list[int], Grade]:
+    """
+    generates puzzle of the given difficulty, its solution and grade.
+    Every cell is tried to be removed once. Removal is kept if the puzzle stays unique and does
+    not get harder than the target, so puzzle is steered to the target without starting over.
+    If the target is not reached, the same solution is tried again with another removal order,
+    up to orders times, and then a new solution is filled from the same seed, up to grids solutions.
+    Raises ValueError if the target is still not reached or budget runs out first, so a puzzle of
+    another level is never handed out as this one. Work done is counted to stats if given
+    """
+    if difficulty not in LEVELS:
+        raise ValueError(f'Unknown difficulty {difficulty!r}, use one of {LEVELS}')
+
+    target = LEVELS.index(difficulty)
+    rng = Random(seed)
+
+    for _ in range(grids):
+        board = Board()
+        with phase(stats, 'fill'):
+            if not fill(board, rng.shuffle, stats, budget):
+                break  # budget ran out
+        solution = board.cells.copy()
+
+        for _ in range(orders):
+            board = Board(solution)
+            current = grade(solution)
+
+            squares = list(range(len(solution)))
+            rng.shuffle(squares)
+
+            with phase(stats, 'remove'):
+                for i in squares:
+                    number = board.remove(i)
+
+                    if stats is not None:
+                        stats.unique_checks += 1
+
+                    with phase(stats, 'verify'):
+                        result = search(board, 2, budget, stats)
+                        unique = result.complete and result.found == 1
+
+                    if unique:
+                        result = grade(board.cells)
+                        if LEVELS.index(result.level) <= target:
+                            current = result
+                            continue
+
+                    # more than one solution or too hard, put the number back
+                    board.place(i, number)
+
+                    if budget is not None and budget.exhausted:
+                        break
+
+            if current.level == difficulty:
+                return board.cells, solution, current
+
+            if budget is not None and budget.exhausted:
+                break
+
+        if budget is not None and budget.exhausted:
+            break
+
+    if budget is not None and budget.exhausted:
+        raise ValueError(f'Budget ran out ({budget.exhausted}) before a {difficulty} puzzle was found')
+
+    raise ValueError(f'No {difficulty} puzzle found from seed {seed} in {grids} solutions')
@@ -0,0 +1,173 @@
+"""
+Compact grid types for the SUDOKU state.
+
+Grid keeps the 9 x 9 numbers in a single 81 byte bytearray and LockedCells keeps locked
+coordinates as bits of one int. Both behave like the nested lists and the list of (row, col)
+tuples they replace, so grid[row][col], iterating rows and (row, col) in locked still work.
+Other board sizes (16 x 16, 25 x 25, ...) are taken from the number of cells.
+A grid can have a tracker (Sudoku_engine.Tracker over its cells), then grid[row][col] = number
+is written through the tracker so its counters stay right.
+"""
+
+from math import isqrt
+
+SIZE = 9
+CELLS = SIZE * SIZE
+
+
+def _size_of(cells: int) -> int:
+    """returns rows of the board with the given number of cells, raises ValueError if there is none"""
+    size = isqrt(cells)
+
+    if size < 1 or size * size != cells or isqrt(size) ** 2 != size:
+        raise ValueError(f'Grid must have {CELLS} cells or other n⁴ cells, got {cells}')
+
+    return size
+
+
+class Row:
+    """view to one row of the Grid, writes go straight to the grid or through its tracker"""
+
+    __slots__ = ('cells', 'start', 'size', 'tracker')
+
+    def __init__(self, cells: bytearray, start: int, size: int = SIZE, tracker=None):
+        self.cells = cells
+        self.start = start
+        self.size = size
+        self.tracker = tracker
+
+    def __getitem__(self, col):
+        size = self.size
+        if isinstance(col, slice):
+            return list(self.cells[self.start:self.start + size])[col]
+
+        if not 0 <= col < size:
+            if -size <= col < 0:
+                col += size
+            else:
+                raise IndexError('row index out of range')
+
+        return self.cells[self.start + col]
+
+    def __setitem__(self, col: int, number: int):
+        if not 0 <= col < self.size:
+            raise IndexError('row index out of range')
+
+        if self.tracker is not None:
+            self.tracker.set(self.start + col, number)
+        else:
+            self.cells[self.start + col] = number
+
+    def __iter__(self):
+        return iter(self.cells[self.start:self.start + self.size])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, number) -> bool:
+        return number in self.cells[self.start:self.start + self.size]
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class Grid:
+    """9 x 9 grid of numbers stored in 81 bytes, or other size given by the cells, empty cells are 0"""
+
+    __slots__ = ('cells', 'size', 'tracker')
+
+    def __init__(self, cells=None):
+        self.cells = bytearray(CELLS) if cells is None else bytearray(cells)
+        self.size = _size_of(len(self.cells))
+        self.tracker = None  # Tracker over the cells, set by the owner, copies do not get it
+
+    @classmethod
+    def from_lists(cls, grid) -> 'Grid':
+        """makes grid from nested list, e.g. 9 x 9"""
+        if isinstance(grid, Grid):
+            return grid.copy()
+
+        return cls(number for row in grid for number in row)
+
+    def to_lists(self) -> list[list]:
+        """returns grid as nested list, e.g. 9 x 9"""
+        cells = self.cells
+        size = self.size
+        return [list(cells[row * size:row * size + size]) for row in range(size)]
+
+    def copy(self) -> 'Grid':
+        return Grid(self.cells)
+
+    def __getitem__(self, row: int) -> Row:
+        size = self.size
+        if not 0 <= row < size:
+            if -size <= row < 0:
+                row += size
+            else:
+                raise IndexError('grid index out of range')
+
+        return Row(self.cells, row * size, size, self.tracker)
+
+    def __iter__(self):
+        size = self.size
+        return (Row(self.cells, row * size, size, self.tracker) for row in range(size))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Grid):
+            return self.cells == other.cells
+
+        return self.to_lists() == [list(row) for row in other]
+
+    def __repr__(self) -> str:
+        return f'Grid({self.to_lists()!r})'
+
+
+class LockedCells:
+    """set of locked (row, col) coordinates stored as bits of one int, bit row * size + col"""
+
+    __slots__ = ('bits', 'size')
+
+    def __init__(self, bits: int = 0, size: int = SIZE):
+        self.bits = bits
+        self.size = size  # rows of the grid
+
+    @classmethod
+    def from_grid(cls, grid) -> 'LockedCells':
+        """locks every cell of the grid that has a number"""
+        bits = 0
+        for i, number in enumerate(number for row in grid for number in row):
+            if number != 0:
+                bits |= 1 << i
+
+        return cls(bits, len(grid))
+
+    def add(self, coordinate: tuple[int, int]):
+        row, col = coordinate
+        self.bits |= 1 << (row * self.size + col)
+
+    def __contains__(self, coordinate) -> bool:
+        row, col = coordinate
+        size = self.size
+        return 0 <= row < size and 0 <= col < size and bool(self.bits >> (row * size + col) & 1)
+
+    def __iter__(self):
+        size = self.size
+        return ((i // size, i % size) for i in range(size * size) if self.bits >> i & 1)
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LockedCells):
+            return self.bits == other.bits
+
+        return sorted(self) == sorted(other)
+
+    def __repr__(self) -> str:
+        return f'LockedCells({list(self)!r})'
@@ -0,0 +1,297 @@
+"""
+PyQt5 user interface for the SUDOKU game, layout is loaded from Sudoku_main.ui next to this file.
+The 9 x 9 cells come from the layout, cells of the other board sizes are made when the size is chosen.
+"""
+
+import os
+from PyQt5 import uic
+from PyQt5.QtCore import QRegularExpression, QTimer, Qt
+from PyQt5.QtGui import QKeySequence, QRegularExpressionValidator
+from PyQt5.QtWidgets import (
+    QMainWindow, QPushButton, QLabel, QGridLayout, QLineEdit, QWidget, QAction, QActionGroup, QFrame, QShortcut,
+    QWIDGETSIZE_MAX,
+)
+import logging
+
+from Sudoku_core import SUDOKU
+from Sudoku_engine import SYMBOLS
+
+UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Sudoku_main.ui')
+BOX_SIZES = (2, 3, 4, 5)  # boards of 4 x 4, 9 x 9, 16 x 16 and 25 x 25 cells
+
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super(MainWindow, self).__init__()
+        uic.loadUi(UI_FILE, self)  # Load the .ui file
+        self.cells = []
+        self.find_widget_cells()  # collects all QLineEdit cells to self.cells variable
+        self.sudoku = SUDOKU()
+        self.populate_cells()
+
+        # hide this info label by default
+        self.label_info: QLabel
+        self.label_info.hide()
+
+        # auto solve puzzle
+        self.actionAuto_solve: QAction
+        self.actionAuto_solve.triggered.connect(self.auto_solve)
+
+        # new game
+        self.actionNew_game: QAction
+        self.actionNew_game.triggered.connect(self.new_game)
+
+        # validate puzzle
+        self.pushButton_validate: QPushButton
+        self.pushButton_validate.clicked.connect(self.update_validate_puzzle)
+
+        # undo and redo moves, Ctrl+Z and Ctrl+Y (or Ctrl+Shift+Z)
+        QShortcut(QKeySequence.Undo, self, self.undo_move)
+        QShortcut(QKeySequence.Redo, self, self.redo_move)
+
+        # hint of the next number, Ctrl+H
+        QShortcut(QKeySequence('Ctrl+H'), self, self.show_hint)
+
+        # board size
+        menu = self.menuBar().addMenu('Board size')
+        sizes = QActionGroup(self)
+        for box in BOX_SIZES:
+            action = menu.addAction(f'{box * box} x {box * box}')
+            action.setCheckable(True)
+            action.setChecked(box == self.sudoku.box)
+            action.triggered.connect(lambda checked, box=box: self.set_box(box))
+            sizes.addAction(action)
+
+        self.show()
+
+    @staticmethod
+    def layout_widgets(layout) -> list[QWidget] or None:
+        """returns all widget in layout"""
+        return (layout.itemAt(i).widget() for i in range(layout.count()))
+
+    def find_widget_cells(self):
+        """finds all widget cells"""
+        self.gridLayout_cells: QGridLayout
+        layout = self.gridLayout_cells
+        widgets = self.layout_widgets(layout)
+
+        cells = []
+        # find all cells
+        if widgets is not None:
+            for w in widgets:
+                if isinstance(w, QLineEdit):
+                    cells.append(w)
+        else:
+            logging.error('None of the cells found!')
+
+        self.cells = cells
+
+        # index of the cells by (row, col), object names are read only once here
+        self.cell_widgets: dict[tuple[int, int], QLineEdit] = {}
+        for widget in cells:
+            coord = widget.objectName().split('_')
+            self.cell_widgets[int(coord[-2]), int(coord[-1])] = widget
+
+        self._shown = {}  # (row, col) -> (style, read only) last set to the cell by refresh_cells
+
+        # every edit is placed to the puzzle right away, so validation does not need to read the cells
+        for (row, col), widget in self.cell_widgets.items():
+            widget.textEdited.connect(lambda text, row=row, col=col: self.cell_edited(row, col, text))
+
+    def cell_edited(self, row: int, col: int, text: str):
+        """places number of the edited cell to sudoku.Puzzle, empty cell clears the number"""
+        text = text.strip().upper()
+        self.sudoku.place_number(row, col, SYMBOLS.index(text) + 1 if text and text in SYMBOLS else 0)
+
+    def build_cells(self, box: int):
+        """replaces cells of the layout with cells of the board of box x box boxes, boxes are separated by lines"""
+        layout = self.gridLayout_cells
+
+        while layout.count():
+            widget = layout.takeAt(0).widget()
+            if widget is not None:
+                widget.hide()  # deleted when control returns to the event loop
+                widget.deleteLater()
+
+        size = box * box
+        symbols = SYMBOLS[:size]
+        validator = QRegularExpressionValidator(QRegularExpression(f'[{symbols}{symbols.lower()}]?'), self)
+
+        # layout has a line after every box, cell (row, col) is at (row + row // box, col + col // box)
+        for row in range(size):
+            for col in range(size):
+                widget = QLineEdit(self)
+                widget.setObjectName(f'lineEdit_{row}_{col}')
+                widget.setStatusTip(f'{row}/{col}')
+                widget.setFixedSize(30, 30)
+                widget.setMaxLength(1)
+                widget.setValidator(validator)
+                widget.setAlignment(Qt.AlignCenter)
+                layout.addWidget(widget, row + row // box, col + col // box)
+
+        span = size + box - 1
+        for band in range(1, box):
+            position = band * (box + 1) - 1
+            layout.addWidget(self._line(QFrame.HLine), position, 0, 1, span)
+            layout.addWidget(self._line(QFrame.VLine), 0, position, span, 1)
+
+        self.find_widget_cells()
+
+        # window size of the layout file fits only 9 x 9 cells
+        self.setMinimumSize(0, 0)
+        self.setMaximumSize(QWIDGETSIZE_MAX, QWIDGETSIZE_MAX)
+        self.centralWidget().adjustSize()
+        self.adjustSize()
+        self.setFixedSize(self.sizeHint())
+
+    def _line(self, shape) -> QFrame:
+        line = QFrame(self)
+        line.setFrameShape(shape)
+        line.setFrameShadow(QFrame.Sunken)
+        return line
+
+    def set_box(self, box: int):
+        """starts new game on the board of box x box boxes"""
+        if box == self.sudoku.box:
+            return
+
+        self.build_cells(box)
+        self.sudoku.box = box
+        self.sudoku.difficulty = None  # difficulty is for the 9 x 9 board only
+        self.new_game()
+
+    def refresh_cells(self, states: dict[tuple[int, int], tuple[str, str, bool]]):
+        """
+        sets (text, style, read only) to cells given by (row, col), cells already showing it are skipped.
+        Signals of the cells are blocked while they change and the window is repainted once at the end
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for coord, (text, style, read_only) in states.items():
+                widget = self.cell_widgets[coord]
+                shown = self._shown.get(coord)
+
+                if widget.text() == text and shown == (style, read_only):
+                    continue
+
+                blocked = widget.blockSignals(True)
+                if widget.text() != text:
+                    widget.setText(text)
+                if shown is None or shown[0] != style:
+                    widget.setStyleSheet(style)
+                widget.setReadOnly(read_only)
+                widget.blockSignals(blocked)
+
+                self._shown[coord] = (style, read_only)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def populate_cells(self):
+        """populates all cells at the start of the game"""
+        puzzle = self.sudoku.Puzzle
+        states = {}
+
+        for row, col in self.cell_widgets:
+            number = puzzle[row][col]
+
+            # starting numbers are bold and cannot be edited, other cells are reset
+            if number != 0:
+                states[row, col] = (SYMBOLS[number - 1], "color: black; font-weight: bold;", True)
+            else:
+                states[row, col] = ('', "color: black; font-weight: light;", False)
+
+        self.refresh_cells(states)
+
+    def update_validate_puzzle(self):
+        """validates sudoku.Puzzle, numbers are already placed when cells are edited"""
+        self.label_info: QLabel
+
+        # check if sudoku is valid
+        if self.sudoku.is_valid():
+            msg = 'Sudoku is valid'
+        else:
+            msg = 'Sudoku is not valid'
+
+        self.info_text(msg, 3000)
+
+    def info_text(self, msg: str, timer: int):
+        """shows info text for msec of the timer value"""
+        self.label_info.show()
+        self.label_info.setText(msg)
+        QTimer.singleShot(timer, self.label_info.hide)
+
+    def auto_solve(self):
+        """auto solves the grid"""
+        self.sudoku.fill_solution()  # written as one move, the solution itself stays untouched
+        grid = self.sudoku.Puzzle
+        locked = self.sudoku.locked_coordinates
+        states = {}
+
+        for (row, col), widget in self.cell_widgets.items():
+            # skip locked coordinates
+            if (row, col) in locked:
+                continue
+
+            number = SYMBOLS[grid[row][col] - 1]
+
+            # if cell contains number already, and it's correct bold it mark is as green
+            if widget.text().upper() == number:
+                style = "color: green; font-weight: bold;"
+            else:
+                style = "color: red; font-weight: bold;"
+
+            states[row, col] = (number, style, True)  # set cell to non-editable after auto solve has been used
+
+        self.refresh_cells(states)
+
+    def show_hint(self):
+        """shows the next number that can be found and the technique to find it"""
+        hint = self.sudoku.next_hint()
+
+        if hint is None:
+            self.info_text('No hint, the next number needs guessing', 3000)
+            return
+
+        symbol = SYMBOLS[hint.number - 1]
+        if hint.technique == 'mistake':
+            self.info_text(f'Cell {hint.row}/{hint.col} should be {symbol}', 3000)
+        else:
+            self.info_text(f'{symbol} to cell {hint.row}/{hint.col} by {hint.technique}', 3000)
+
+    def undo_move(self):
+        """takes back the latest move, e.g. the auto solve"""
+        if self.sudoku.undo():
+            self.show_open_cells()
+        else:
+            self.info_text('Nothing to undo', 1500)
+
+    def redo_move(self):
+        """makes the latest undone move again"""
+        if self.sudoku.redo():
+            self.show_open_cells()
+        else:
+            self.info_text('Nothing to redo', 1500)
+
+    def show_open_cells(self):
+        """
+        shows numbers of the puzzle in every cell that is not locked and makes them editable, so marks of
+        auto solve are cleared from the cells it did not change as well. Unchanged cells are skipped by refresh_cells
+        """
+        puzzle = self.sudoku.Puzzle
+        locked = self.sudoku.locked_coordinates
+        states = {}
+
+        for row, col in self.cell_widgets:
+            if (row, col) in locked:
+                continue
+
+            number = puzzle[row][col]
+            states[row, col] = (SYMBOLS[number - 1] if number else '', "color: black; font-weight: light;", False)
+
+        self.refresh_cells(states)
+
+    def new_game(self):
+        """starts new game"""
+        self.sudoku.generate()
+        self.populate_cells()
+        self.info_text('New game started!', 3000)
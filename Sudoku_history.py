@@ -0,0 +1,195 @@
+"""
+Undo / redo history of a SUDOKU game kept as a log of cell changes.
+
+Every move is one packed int of (cell, old number, new number) in an array, 4 bytes a move,
+so the game is never copied to remember it. Undo and redo move a cursor along the log and a
+snapshot is just a position in it, restoring one replays the moves between the cursor and the
+snapshot. Moves made at once (e.g. filling in the solution) are joined to one group that is
+undone and redone together. A new move after undo drops the moves that could have been redone,
+it cuts the log. A snapshot remembers how many cuts there had been, it is gone if a later cut
+went below its position. Only the cuts that are the lowest one since an earlier cut are kept,
+8 bytes each, so the log takes 4 bytes a move and 8 bytes for some of the moves made after undo.
+
+    history.record(cell, 0, 5)
+    snapshot = history.snapshot()
+    history.undo()              -> [(cell, 0)], writes that take the grid one group back
+    history.seek(snapshot)      -> [(cell, 5)]
+"""
+
+import sys
+from array import array
+from bisect import bisect_right
+from typing import NamedTuple
+
+_JOINED = 1 << 31  # move belongs to the group of the move before it
+_CELL = 16
+_OLD = 8
+
+
+class Move(NamedTuple):
+    cell: int  # flat index, row * size + col
+    old: int  # number before the move, 0 for empty
+    new: int  # number after the move, 0 for empty
+
+
+class Snapshot(NamedTuple):
+    position: int  # moves from the start of the game
+    cuts: int  # cuts of the log before the snapshot, later cuts below the position drop it
+
+
+def _unpack(move: int) -> Move:
+    return Move(move >> _CELL & 0x7fff, move >> _OLD & 0xff, move & 0xff)
+
+
+class History:
+    """log of moves with undo / redo cursor, writes are returned as (cell, number) for the owner to apply"""
+
+    __slots__ = ('moves', 'cursor', '_cuts', '_low_cuts', '_low_positions')
+
+    def __init__(self):
+        self.moves = array('I')  # packed moves, cell << 16 | old << 8 | new, top bit joins the move to the group before
+        self.cursor = 0  # moves before the cursor are done, moves after it can be redone
+        self._cuts = 0  # times the log has been cut
+        # cut number and position of the cuts that are the lowest since an earlier cut, both rise
+        self._low_cuts = array('I')
+        self._low_positions = array('I')
+
+    def record(self, cell: int, old: int, new: int, joined: bool = False):
+        """records move that has been made, joined move is undone together with the move before it"""
+        if self.cursor < len(self.moves):
+            del self.moves[self.cursor:]
+            self._cut(self.cursor)
+
+        joined = joined and self.cursor > 0
+        self.moves.append((_JOINED if joined else 0) | cell << _CELL | old << _OLD | new)
+        self.cursor += 1
+
+    def _cut(self, position: int):
+        """counts cut of the log at position, earlier cuts at or above it can no longer be the lowest one after a snapshot"""
+        self._cuts += 1
+        cuts, positions = self._low_cuts, self._low_positions
+        while positions and positions[-1] >= position:
+            del cuts[-1]
+            del positions[-1]
+
+        cuts.append(self._cuts)
+        positions.append(position)
+
+    def undo(self) -> list[tuple[int, int]]:
+        """moves the cursor one group back and returns its (cell, old number) writes, empty if there is nothing to undo"""
+        writes = []
+        moves = self.moves
+
+        while self.cursor > 0:
+            self.cursor -= 1
+            move = moves[self.cursor]
+            writes.append((move >> _CELL & 0x7fff, move >> _OLD & 0xff))
+
+            if not move & _JOINED:
+                break
+
+        return writes
+
+    def redo(self) -> list[tuple[int, int]]:
+        """moves the cursor one group forward and returns its (cell, new number) writes, empty if there is nothing to redo"""
+        writes = []
+        moves = self.moves
+
+        while self.cursor < len(moves):
+            move = moves[self.cursor]
+            writes.append((move >> _CELL & 0x7fff, move & 0xff))
+            self.cursor += 1
+
+            if self.cursor == len(moves) or not moves[self.cursor] & _JOINED:
+                break
+
+        return writes
+
+    def can_undo(self) -> bool:
+        return self.cursor > 0
+
+    def can_redo(self) -> bool:
+        return self.cursor < len(self.moves)
+
+    def snapshot(self) -> Snapshot:
+        """returns current position, costs no copy of the grid"""
+        return Snapshot(self.cursor, self._cuts)
+
+    def is_valid(self, snapshot: Snapshot) -> bool:
+        """if the moves up to the snapshot are still in the log, no cut since the snapshot went below it"""
+        if snapshot.position > len(self.moves):
+            return False
+
+        # lowest cut after the snapshot is the first one kept with a later cut number
+        i = bisect_right(self._low_cuts, snapshot.cuts)
+        return i == len(self._low_cuts) or self._low_positions[i] >= snapshot.position
+
+    def seek(self, snapshot: Snapshot) -> list[tuple[int, int]]:
+        """
+        moves the cursor to the snapshot and returns the (cell, number) writes that take the grid there.
+        Raises ValueError if the moves of the snapshot have been dropped by a new move after undo
+        """
+        if not self.is_valid(snapshot):
+            raise ValueError('Snapshot is not in the history anymore')
+
+        moves = self.moves
+        writes = []
+
+        while self.cursor > snapshot.position:
+            self.cursor -= 1
+            move = moves[self.cursor]
+            writes.append((move >> _CELL & 0x7fff, move >> _OLD & 0xff))
+
+        while self.cursor < snapshot.position:
+            move = moves[self.cursor]
+            writes.append((move >> _CELL & 0x7fff, move & 0xff))
+            self.cursor += 1
+
+        return writes
+
+    def to_bytes(self) -> bytes:
+        """returns the packed moves as little-endian 4 byte ints, cursor is saved by the owner"""
+        moves = self.moves
+        if sys.byteorder != 'little':
+            moves = array('I', moves)
+            moves.byteswap()
+
+        return moves.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, cursor: int, cells: int = None, size: int = None) -> 'History':
+        """
+        makes history of moves from to_bytes with the cursor at cursor. Raises ValueError if the cursor does not fit,
+        or if cells and size of the board are given and a move is not on a board of cells with numbers 0 - size
+        """
+        history = cls()
+        history.moves.frombytes(data)
+        if sys.byteorder != 'little':
+            history.moves.byteswap()
+
+        if not 0 <= cursor <= len(history.moves):
+            raise ValueError(f'History cursor {cursor} is out of the {len(history.moves)} moves')
+
+        if cells is not None:
+            for move in history.moves:
+                if move >> _CELL & 0x7fff >= cells or move >> _OLD & 0xff > size or move & 0xff > size:
+                    raise ValueError(f'{_unpack(move)} is not a move on the board of {cells} cells')
+
+        history.cursor = cursor
+        return history
+
+    def clear(self):
+        """forgets all moves, e.g. when a new game starts"""
+        del self.moves[:]
+        self._cut(0)
+        self.cursor = 0
+
+    def __iter__(self):
+        """yields moves that are done, oldest first"""
+        return (_unpack(move) for move in self.moves[:self.cursor])
+
+    def __len__(self) -> int:
+        return self.cursor
+
+    def __repr__(self) -> str:
+        return f'History({self.cursor} of {len(self.moves)} moves)'
@@ -0,0 +1,92 @@
+"""
+Compact file formats for SUDOKU puzzles.
+
+text    one puzzle per line, 81 characters where empty cells are '.'
+        and optionally its solution after a space
+binary  fixed size records of 52 bytes without a header:
+        41 bytes  solution, two cells per byte (high nibble first)
+        11 bytes  bitmap of cells that are given in the puzzle (bit i = cell i)
+"""
+
+from Sudoku_engine import CELLS, from_string, to_string
+
+SOLUTION_BYTES = (CELLS + 1) // 2
+BITMAP_BYTES = (CELLS + 7) // 8
+RECORD_SIZE = SOLUTION_BYTES + BITMAP_BYTES
+FORMATS = ('text', 'binary')
+
+
+def pack_record(puzzle: list[int], solution: list[int]) -> bytes:
+    """packs puzzle and its solution to RECORD_SIZE bytes"""
+    numbers = solution + [0] * (SOLUTION_BYTES * 2 - CELLS)
+    packed = bytes(numbers[i] << 4 | numbers[i + 1] for i in range(0, len(numbers), 2))
+
+    givens = 0
+    for i, number in enumerate(puzzle):
+        if number != 0:
+            givens |= 1 << i
+
+    return packed + givens.to_bytes(BITMAP_BYTES, 'little')
+
+
+def unpack_record(data: bytes) -> tuple[list[int], list[int]]:
+    """unpacks puzzle and its solution from RECORD_SIZE bytes"""
+    solution = []
+    for byte in data[:SOLUTION_BYTES]:
+        solution.append(byte >> 4)
+        solution.append(byte & 0xF)
+    del solution[CELLS:]
+
+    givens = int.from_bytes(data[SOLUTION_BYTES:RECORD_SIZE], 'little')
+    puzzle = [number if givens >> i & 1 else 0 for i, number in enumerate(solution)]
+
+    return puzzle, solution
+
+
+def write_puzzles(file, records, fmt: str = 'text', solutions: bool = False, chunk: int = 1024) -> int:
+    """
+    writes records with puzzle and solution strings to open file and returns number of written puzzles.
+    Records are consumed lazily and written every chunk records, so memory use stays flat
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown format {fmt!r}, use one of {FORMATS}')
+
+    written = 0
+    buffer = []
+    join = ''.join if fmt == 'text' else b''.join
+
+    for record in records:
+        if fmt == 'text':
+            buffer.append(f'{record.puzzle} {record.solution}\n' if solutions else f'{record.puzzle}\n')
+        else:
+            buffer.append(pack_record(from_string(record.puzzle), from_string(record.solution)))
+
+        if len(buffer) == chunk:
+            file.write(join(buffer))
+            written += len(buffer)
+            buffer.clear()
+
+    if buffer:
+        file.write(join(buffer))
+        written += len(buffer)
+
+    file.flush()
+    return written
+
+
+def read_puzzles(file, fmt: str = 'text'):
+    """yields (puzzle, solution) strings from open file, solution is None if the text line has only the puzzle"""
+    if fmt == 'text':
+        for line in file:
+            parts = line.split()
+            if parts:
+                yield parts[0], parts[1] if len(parts) > 1 else None
+    elif fmt == 'binary':
+        while data := file.read(RECORD_SIZE):
+            if len(data) != RECORD_SIZE:
+                raise ValueError('Truncated puzzle record')
+
+            puzzle, solution = unpack_record(data)
+            yield to_string(puzzle), to_string(solution)
+    else:
+        raise ValueError(f'Unknown format {fmt!r}, use one of {FORMATS}')
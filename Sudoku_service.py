@@ -0,0 +1,368 @@
+"""
+Asyncio SUDOKU service with a pool of pre-generated puzzles.
+
+Clients talk JSON lines over TCP or a Unix socket, one request object per line and one
+response object per line. Every response has "ok" and failed requests have "error".
+
+    {"cmd": "new"}                                  -> {"ok": true, "game": 1, "puzzle": "..5.1.."}
+    {"cmd": "place", "game": 1, "row": 0, "col": 2, "number": 4}
+                                                    -> {"ok": true, "placed": true}, or "placed": false
+                                                       and "reason" if the cell or number is not allowed
+    {"cmd": "undo", "game": 1}                      -> {"ok": true, "changed": [[0, 2, 0]]}
+    {"cmd": "redo", "game": 1}                      -> {"ok": true, "changed": [[0, 2, 4]]}
+    {"cmd": "validate", "game": 1}                  -> {"ok": true, "valid": false, "complete": false,
+                                                        "conflicts": [[0, 2], [0, 7]]}
+    {"cmd": "hint", "game": 1}                      -> {"ok": true, "hint": {"row": 0, "col": 1, "number": 9,
+                                                        "technique": "naked single", "after": []} or null}
+    {"cmd": "candidates", "game": 1}                -> {"ok": true, "candidates": [[0, 1, [3, 9]], ...]}
+    {"cmd": "solve", "game": 1}                     -> {"ok": true, "solution": "345..."}
+    {"cmd": "solve", "puzzle": "..5.1.."}           -> {"ok": true, "solution": "345..." or null,
+                                                        "complete": true}
+    {"cmd": "close", "game": 1}                     -> {"ok": true}
+    {"cmd": "stats"}                                -> {"ok": true, "pool_depth": 98, ...}
+
+Puzzles are generated in a process pool in the background and kept in a queue, so "new"
+takes a ready puzzle and does not wait for the generation unless the pool has run dry.
+With --variants every generated puzzle is also served shuffled (Sudoku_transform), which
+costs microseconds instead of a generation.
+Solving a puzzle sent by the client is cut off after --solve-timeout seconds, then the
+response has "complete": false and no solution.
+Games keep their moves as a log of cell changes (Sudoku_history), "changed" of undo and redo
+lists [row, col, number] of the cells, empty if there was nothing to take back or make again.
+With --sessions the games are saved to a session file (Sudoku_session) when the service stops
+and read back when it starts, so a restart keeps the games and their moves.
+Optional "id" of the request is copied to the response. A request line longer than
+LINE_LIMIT bytes is skipped and answered with an error, the connection stays open.
+
+    python Sudoku_server.py serve --port 8765 --pool 200
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from random import SystemRandom
+
+from Sudoku_batch import PuzzleRecord, iter_seeds, make_record
+from Sudoku_core import SUDOKU
+from Sudoku_engine import Board, Budget, flatten, from_string, search, to_string
+from Sudoku_session import Sessions, load_sessions, save_sessions
+from Sudoku_transform import variants
+
+LINE_LIMIT = 2 ** 16  # bytes of one request line, longer lines are skipped
+
+class PuzzlePool:
+    """keeps a queue of ready puzzles topped up from a process pool"""
+
+    def __init__(self, size: int = 100, workers: int = None, seed: int = None, variants: int = 1):
+        self.size = size
+        self.variants = variants  # puzzles queued from every generated puzzle, the original and shuffled copies
+        self.workers = workers or os.cpu_count() or 1
+        self.seeds = iter_seeds(SystemRandom().getrandbits(64) if seed is None else seed)
+        self.queue: asyncio.Queue[PuzzleRecord] = asyncio.Queue(maxsize=size)
+        self.executor = ProcessPoolExecutor(self.workers)
+        self.generated = 0
+        self.served = 0
+        self._finished = deque(maxlen=100)  # finish times of the latest puzzles for the refill rate
+        self._tasks = []
+
+    def start(self):
+        """starts one refill task per worker"""
+        self._tasks = [asyncio.create_task(self._refill()) for _ in range(self.workers)]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown(cancel_futures=True)
+
+    async def _refill(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            record = await loop.run_in_executor(self.executor, make_record, next(self.seeds))
+            await self.queue.put(record)  # waits while the pool is full
+
+            self.generated += 1
+            self._finished.append(time.monotonic())
+
+            if self.variants > 1:
+                shuffled = variants(from_string(record.puzzle), from_string(record.solution), record.seed)
+                for puzzle, solution in itertools.islice(shuffled, self.variants - 1):
+                    await self.queue.put(PuzzleRecord(None, to_string(puzzle), to_string(solution)))
+
+    async def get(self) -> PuzzleRecord:
+        """returns ready puzzle, waits only if the pool is empty"""
+        self.served += 1
+
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return await self.queue.get()
+
+    def refill_rate(self) -> float:
+        """puzzles generated per second over the latest puzzles, shuffled copies are not counted"""
+        if len(self._finished) < 2:
+            return 0.0
+
+        span = self._finished[-1] - self._finished[0]
+        return (len(self._finished) - 1) / span if span > 0 else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'pool_depth': self.queue.qsize(),
+            'pool_size': self.size,
+            'variants': self.variants,
+            'refill_rate': round(self.refill_rate(), 2),
+            'generated': self.generated,
+            'served': self.served,
+        }
+
+
+def solve_within(cells: list[int], seconds: float = None) -> tuple[list[int] | None, bool]:
+    """returns (solution or None, if the search finished) of a search cut off after seconds, runs in the worker"""
+    try:
+        board = Board(cells)
+    except ValueError:
+        return None, True  # duplicate numbers, no solution
+
+    result = search(board, 1, Budget(seconds=seconds))
+    return result.solution, result.complete
+
+
+class SudokuService:
+    """JSON lines request handler, games are kept in memory by game id"""
+
+    def __init__(self, pool: PuzzlePool, solve_timeout: float = None, games=None):
+        self.pool = pool
+        self.solve_timeout = solve_timeout  # seconds a puzzle of a client may take to solve, no limit if None
+        self.games: dict[int, SUDOKU] = {} if games is None else games  # or Sessions read from a session file
+        self._game_ids = itertools.count(max(self.games, default=0) + 1)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while (line := await self._read_line(reader)) != b'':
+                if line is None:
+                    response = {'ok': False, 'error': f'Request line is longer than {LINE_LIMIT} bytes'}
+                else:
+                    response = await self.handle_line(line)
+
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader) -> bytes | None:
+        """
+        returns next line of the client, b'' at the end. Returns None for a line longer than the limit
+        of the reader, it is read to its end and dropped so the next line is a request again
+        """
+        try:
+            return await reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as e:
+            return e.partial  # last line without a newline
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+        while True:
+            await reader.readexactly(consumed)  # dropped, the newline is not in it
+            try:
+                await reader.readuntil(b'\n')
+                return None
+            except asyncio.IncompleteReadError:
+                return None  # client went away in the middle of the line
+            except asyncio.LimitOverrunError as e:
+                consumed = e.consumed
+
+    async def handle_line(self, line: bytes) -> dict:
+        """returns response for one request line"""
+        request_id = None
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('Request must be a JSON object')
+
+            request_id = request.get('id')
+            command = getattr(self, f'cmd_{request.get("cmd")}', None)
+
+            if command is None:
+                raise ValueError(f'Unknown command {request.get("cmd")!r}')
+
+            response = {'ok': True, **await command(request)}
+        except (ValueError, KeyError, TypeError) as e:
+            response = {'ok': False, 'error': str(e) if not isinstance(e, KeyError) else f'Missing {e}'}
+        except Exception as e:
+            # a bad request must never drop the connection of the client
+            logging.exception('Request %r failed', line[:200])
+            response = {'ok': False, 'error': f'Internal error: {type(e).__name__}'}
+
+        if request_id is not None:
+            response['id'] = request_id
+
+        return response
+
+    @staticmethod
+    def _int(request: dict, name: str) -> int:
+        """returns field of the request that must be an integer, raises ValueError if it is not"""
+        value = request[name]
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f'{name} must be an integer, got {value!r}')
+
+        return value
+
+    @staticmethod
+    def _str(request: dict, name: str) -> str:
+        """returns field of the request that must be a string, raises ValueError if it is not"""
+        value = request[name]
+        if not isinstance(value, str):
+            raise ValueError(f'{name} must be a string, got {type(value).__name__}')
+
+        return value
+
+    def _game(self, request: dict) -> SUDOKU:
+        try:
+            return self.games[request['game']]
+        except KeyError:
+            raise ValueError(f'Unknown game {request.get("game")!r}') from None
+
+    # ---------------------------
+    # Commands
+    # ---------------------------
+
+    async def cmd_new(self, request: dict) -> dict:
+        record = await self.pool.get()
+        game_id = next(self._game_ids)
+        self.games[game_id] = SUDOKU.from_puzzle(from_string(record.puzzle), from_string(record.solution), record.seed)
+
+        return {'game': game_id, 'puzzle': record.puzzle}
+
+    async def cmd_place(self, request: dict) -> dict:
+        sudoku = self._game(request)
+        row, col, number = self._int(request, 'row'), self._int(request, 'col'), self._int(request, 'number')
+
+        # reason is sent to the client, place_number would print it to the stdout of the service
+        error = sudoku.placement_error(row, col, number)
+        if error is not None:
+            return {'placed': False, 'reason': error}
+
+        return {'placed': sudoku.place_number(row, col, number)}
+
+    async def cmd_undo(self, request: dict) -> dict:
+        sudoku = self._game(request)
+        return {'changed': self._changed(sudoku, sudoku.undo())}
+
+    async def cmd_redo(self, request: dict) -> dict:
+        sudoku = self._game(request)
+        return {'changed': self._changed(sudoku, sudoku.redo())}
+
+    @staticmethod
+    def _changed(sudoku: SUDOKU, coords: list[tuple[int, int]]) -> list[list[int]]:
+        return [[row, col, sudoku.Puzzle[row][col]] for row, col in coords]
+
+    async def cmd_hint(self, request: dict) -> dict:
+        hint = self._game(request).next_hint()
+        return {'hint': None if hint is None else hint._asdict()}
+
+    async def cmd_candidates(self, request: dict) -> dict:
+        candidates = self._game(request).candidates()
+        return {'candidates': [[row, col, numbers] for (row, col), numbers in candidates.items()]}
+
+    async def cmd_validate(self, request: dict) -> dict:
+        sudoku = self._game(request)
+
+        conflicts = sudoku.conflicts()
+
+        return {'valid': not conflicts, 'complete': 0 not in sudoku.Puzzle.cells, 'conflicts': conflicts}
+
+    async def cmd_solve(self, request: dict) -> dict:
+        if 'puzzle' not in request:
+            return {'solution': to_string(flatten(self._game(request).solution))}
+
+        # solving an unknown puzzle is cpu work, keep it off the event loop, and a pathological
+        # puzzle must not keep the worker busy for long
+        cells = from_string(self._str(request, 'puzzle'))
+        solution, complete = await asyncio.get_running_loop().run_in_executor(
+            self.pool.executor, solve_within, cells, self.solve_timeout)
+
+        return {'solution': to_string(solution) if solution is not None else None, 'complete': complete}
+
+    async def cmd_close(self, request: dict) -> dict:
+        self._game(request)
+        del self.games[request['game']]
+
+        return {}
+
+    async def cmd_stats(self, request: dict) -> dict:
+        return {**self.pool.stats(), 'games': len(self.games)}
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765, unix: str = None, pool_size: int = 100,
+                workers: int = None, seed: int = None, variants: int = 1, solve_timeout: float = None,
+                sessions: str = None):
+    """runs the service until cancelled, games are read from and saved to the sessions file if given"""
+    games = None
+    if sessions and os.path.exists(sessions):
+        games = load_sessions(sessions)
+        print(f'> Loaded {len(games)} games from {sessions}')
+
+    pool = PuzzlePool(pool_size, workers, seed, variants)
+    service = SudokuService(pool, solve_timeout, games)
+    pool.start()
+
+    if unix:
+        server = await asyncio.start_unix_server(service.handle_client, path=unix, limit=LINE_LIMIT)
+    else:
+        server = await asyncio.start_server(service.handle_client, host, port, limit=LINE_LIMIT)
+
+    print(f'> SUDOKU service listening on {unix or f"{host}:{port}"}')
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await pool.close()
+
+        if sessions:
+            saved = save_sessions(sessions, service.games)
+            print(f'> Saved {saved} games to {sessions}')
+
+        if isinstance(service.games, Sessions):
+            service.games.close()
+
+
+def main(argv: list[str]) -> int:
+    """command line entry point, returns exit code"""
+    parser = argparse.ArgumentParser(prog='Sudoku_server.py serve', description='SUDOKU JSON lines service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('--pool', type=int, default=100, help='number of ready puzzles to keep')
+    parser.add_argument('-w', '--workers', type=int, help='generator processes, defaults to number of cpus')
+    parser.add_argument('-s', '--seed', type=int, help='seed of the puzzle stream, random if not given')
+    parser.add_argument('--variants', type=int, default=1,
+                        help='puzzles served from every generated puzzle, the rest are shuffled copies')
+    parser.add_argument('--solve-timeout', type=float, default=2.0,
+                        help='seconds solving a puzzle sent by a client may take, 0 for no limit')
+    parser.add_argument('--sessions', help='file the games are saved to on stop and read from on start')
+    args = parser.parse_args(argv)
+
+    if args.variants < 1:
+        parser.error('--variants must be at least 1')
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.pool, args.workers, args.seed, args.variants,
+                          args.solve_timeout or None, args.sessions))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
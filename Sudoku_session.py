@@ -0,0 +1,297 @@
+"""
+Binary save format of SUDOKU games, one game or many in one file.
+
+Session record, version 1, little-endian:
+    18 bytes  header: flags, box, moves, cursor, seed (struct SESSION)
+     n bytes  seed as signed little-endian int, only if flag LONG_SEED is set (seeds below 0 or
+              above 64 bits), the seed of the header is n then
+    41 bytes  solution, two cells per byte as number - 1 (high nibble first), one byte a cell
+              on boards above 16 x 16
+    11 bytes  bitmap of the given cells of the puzzle (bit i = cell i), they are also the locked cells
+    81 bytes  current puzzle, only if flag PUZZLE is set (the moves do not lead to it)
+     4 bytes  every move of the history (Sudoku_history), the current puzzle is the given cells
+              with the moves up to the cursor made
+Sizes are for the 9 x 9 board, a new game takes 70 bytes and every move 4 more.
+
+Session file:
+     6 bytes  magic b'SDKS' and version (struct FILE_HEADER)
+    12 bytes  key and length of the record (struct ENTRY), followed by the record, for every game
+
+Files are mapped to memory and only the positions of the records are read when a file is opened.
+Games are unpacked from the map when they are first used, so opening a file of hundreds of
+thousands of games takes a fraction of a second and unused games stay in the page cache.
+
+    save_sessions('games.bin', service.games)
+    games = load_sessions('games.bin')  # games[key] unpacks the game
+    games.close()  # when the service stops, after saving
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import MutableMapping
+
+from Sudoku_core import SUDOKU
+from Sudoku_history import History
+
+MAGIC = b'SDKS'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sH')
+ENTRY = struct.Struct('<QI')  # key of the game, bytes of its record
+SESSION = struct.Struct('<BBIIQ')  # flags, box, moves, cursor, seed
+
+SEED = 1  # game has a seed
+PUZZLE = 2  # current puzzle is saved, it was replaced and its moves are not in the history
+LONG_SEED = 4  # seed does not fit the 8 unsigned bytes of the header, it follows the header
+
+# bytes.translate tables, so nibbles are packed without a python loop over the cells
+_DOWN = bytes((i - 1) & 0xFF for i in range(256))  # number - 1
+_UP = bytes((i + 1) & 0xFF for i in range(256))  # number + 1
+_HIGH = bytes((i << 4) & 0xFF for i in range(256))  # to high nibble
+_FROM_HIGH = bytes(i >> 4 for i in range(256))
+_FROM_LOW = bytes(i & 0xF for i in range(256))
+
+
+def _solution_bytes(cells: int, size: int) -> int:
+    return (cells + 1) // 2 if size <= 16 else cells
+
+
+def pack_session(sudoku: SUDOKU) -> bytes:
+    """packs game to a session record"""
+    sudoku._track()  # Puzzle may have been replaced, e.g. with nested lists
+    size = sudoku.Puzzle.size
+    cells = size * size
+    history = sudoku.history
+
+    # moves up to the cursor must lead from the given cells to the current puzzle, else it is saved
+    replayed = bytearray(sudoku.orig_puzzle.cells)
+    for move in history:
+        replayed[move.cell] = move.new
+
+    flags = PUZZLE if replayed != sudoku.Puzzle.cells else 0
+    seed = sudoku.ID
+    long_seed = b''
+
+    if seed is None:
+        seed = 0
+    elif 0 <= seed < 1 << 64:
+        flags |= SEED
+    else:
+        flags |= LONG_SEED
+        long_seed = seed.to_bytes(seed.bit_length() // 8 + 1, 'little', signed=True)
+        seed = len(long_seed)
+
+    header = SESSION.pack(flags, sudoku.box, len(history.moves), history.cursor, seed) + long_seed
+
+    solution = bytes(sudoku.solution.cells)
+    if size <= 16:
+        numbers = solution.translate(_DOWN) + bytes(cells % 2)
+        high, low = numbers[0::2].translate(_HIGH), numbers[1::2]
+        solution = (int.from_bytes(high, 'big') | int.from_bytes(low, 'big')).to_bytes(len(high), 'big')
+
+    givens = sudoku.locked_coordinates.bits.to_bytes((cells + 7) // 8, 'little')
+    puzzle = bytes(sudoku.Puzzle.cells) if flags & PUZZLE else b''
+
+    return header + solution + givens + puzzle + history.to_bytes()
+
+
+def unpack_session(data, **kwargs) -> SUDOKU:
+    """unpacks game from a session record, kwargs are given to SUDOKU. Raises ValueError if the record is broken"""
+    data = memoryview(data)
+    if len(data) < SESSION.size:
+        raise ValueError('Truncated session record')
+
+    flags, box, moves, cursor, seed = SESSION.unpack_from(data)
+    size = box * box
+    cells = size * size
+    seed_bytes = seed if flags & LONG_SEED else 0
+    solution_bytes = _solution_bytes(cells, size)
+    bitmap_bytes = (cells + 7) // 8
+    puzzle_bytes = cells if flags & PUZZLE else 0
+
+    start = SESSION.size
+    if box < 1 or len(data) != start + seed_bytes + solution_bytes + bitmap_bytes + puzzle_bytes + 4 * moves:
+        raise ValueError('Broken session record')
+
+    if flags & LONG_SEED:
+        seed = int.from_bytes(data[start:start + seed_bytes], 'little', signed=True)
+        start += seed_bytes
+
+    packed = bytes(data[start:start + solution_bytes])
+    if size <= 16:
+        solution = bytearray(solution_bytes * 2)
+        solution[0::2] = packed.translate(_FROM_HIGH)
+        solution[1::2] = packed.translate(_FROM_LOW)
+        del solution[cells:]
+        solution = solution.translate(_UP)
+    else:
+        solution = packed
+
+    start += solution_bytes
+    givens = int.from_bytes(data[start:start + bitmap_bytes], 'little')
+    puzzle = [number if givens >> i & 1 else 0 for i, number in enumerate(solution)]
+    start += bitmap_bytes
+
+    sudoku = SUDOKU.from_puzzle(puzzle, solution, seed if flags & (SEED | LONG_SEED) else None, **kwargs)
+    sudoku.history = History.from_bytes(data[start + puzzle_bytes:], cursor, cells, size)
+
+    tracker = sudoku._tracker
+    if flags & PUZZLE:
+        for i, number in enumerate(data[start:start + puzzle_bytes]):
+            tracker.set(i, number)
+    else:
+        for move in sudoku.history:
+            tracker.set(move.cell, move.new)
+
+    return sudoku
+
+
+# ---------------------------
+# Session file
+# ---------------------------
+
+class Sessions(MutableMapping):
+    """
+    games by key, games of a session file stay in the memory map of the file and are unpacked when they
+    are first used. Can be used as context manager, close releases the map
+    """
+
+    def __init__(self, data: mmap.mmap = None, records: dict = None, **kwargs):
+        self.data = data  # memory map of the session file, None if there is none
+        self.games: dict[int, SUDOKU] = {}
+        self.records: dict[int, int] = records or {}  # key -> position of the ENTRY of a game not unpacked yet
+        self.kwargs = kwargs  # given to SUDOKU of the unpacked games
+
+    def record(self, key) -> bytes:
+        """returns session record of a game not unpacked yet, sliced out of the map"""
+        position = self.records[key]
+        if isinstance(position, bytes):
+            return position  # map has been closed
+
+        _, length = ENTRY.unpack_from(self.data, position)
+        position += ENTRY.size
+        return self.data[position:position + length]
+
+    def __getitem__(self, key) -> SUDOKU:
+        try:
+            return self.games[key]
+        except KeyError:
+            record = self.record(key)  # KeyError if the game is not here at all
+
+        sudoku = self.games[key] = unpack_session(record, **self.kwargs)
+        del self.records[key]
+        return sudoku
+
+    def __setitem__(self, key, sudoku: SUDOKU):
+        self.records.pop(key, None)
+        self.games[key] = sudoku
+
+    def __delitem__(self, key):
+        if self.records.pop(key, None) is None:
+            del self.games[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.games or key in self.records
+
+    def __iter__(self):
+        # keys are copied, reading a game while iterating moves it from records to games
+        return iter([*self.games, *self.records])
+
+    def __len__(self) -> int:
+        return len(self.games) + len(self.records)
+
+    def packed(self):
+        """yields (key, session record) of every game, records of games not unpacked are not packed again"""
+        for key, sudoku in self.games.items():
+            yield key, pack_session(sudoku)
+
+        for key in list(self.records):
+            yield key, self.record(key)
+
+    def close(self):
+        """releases the map, records of the games not unpacked yet are copied out of it first"""
+        if self.data is not None:
+            self.records = {key: self.record(key) for key in self.records}
+            self.data.close()
+            self.data = None
+
+    def __enter__(self) -> 'Sessions':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_sessions(path: str, games) -> int:
+    """
+    saves games given as mapping of int key -> SUDOKU (or Sessions) to a session file, returns number of games.
+    File is written next to path and moved over it at the end, so a crash never leaves half a file
+    """
+    items = games.packed() if isinstance(games, Sessions) else ((key, pack_session(game)) for key, game in games.items())
+    temporary = f'{path}.tmp'
+    saved = 0
+
+    try:
+        with open(temporary, 'wb') as file:
+            buffer = [FILE_HEADER.pack(MAGIC, VERSION)]
+
+            for key, record in items:
+                buffer.append(ENTRY.pack(key, len(record)))
+                buffer.append(record)
+                saved += 1
+
+                if len(buffer) >= 2048:
+                    file.write(b''.join(buffer))
+                    buffer.clear()
+
+            file.write(b''.join(buffer))
+
+        os.replace(temporary, path)
+    except BaseException:
+        # path keeps the games of the last save, half a file is not left next to it
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return saved
+
+
+def load_sessions(path: str, **kwargs) -> Sessions:
+    """
+    maps session file to memory and returns its games, only the positions of the records are read here.
+    Games are unpacked on first use with kwargs given to SUDOKU. The map stays open until Sessions is closed,
+    the file can still be replaced by save_sessions meanwhile (the map keeps the old file).
+    Raises ValueError if the file is not a session file of a known version
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size < FILE_HEADER.size:
+            raise ValueError(f'{path} is not a session file')
+
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # map stays open after the file is closed
+
+    try:
+        magic, version = FILE_HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a session file')
+        if version != VERSION:
+            raise ValueError(f'Session file version {version} is not supported, expected {VERSION}')
+
+        records = {}
+        position = FILE_HEADER.size
+        end = len(data)
+        unpack_entry = ENTRY.unpack_from
+
+        while position < end:
+            if position + ENTRY.size > end:
+                raise ValueError('Truncated session file')
+
+            key, length = unpack_entry(data, position)
+            records[key] = position
+            position += ENTRY.size + length
+
+        if position != end:
+            raise ValueError('Truncated session file')
+    except Exception:
+        data.close()
+        raise
+
+    return Sessions(data, records, **kwargs)
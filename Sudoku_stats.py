@@ -0,0 +1,114 @@
+"""
+Counters and phase timers for the solver and the generator.
+
+Hot paths count into local variables and add them to a Stats once per call, only when one is
+given, so a run without Stats costs the same as before. Phases are timed with perf_counter
+and the optional callback is told about every finished phase, e.g. to log slow puzzles.
+
+    stats = Stats()
+    puzzle, solution = generate(seed, stats=stats)
+    print(stats.nodes, stats.timers['remove'])
+
+    with profile('generate.prof'):  # cProfile, read with pstats.Stats('generate.prof')
+        generate(seed)
+
+Counters:
+    nodes           search nodes visited (cells tried to fill in fill, branches in the search)
+    backtracks      numbers taken back because they led to no solution (or not to enough of them)
+    checks          validity checks, can_place calls in fill and peer candidate masks looked at in the search
+    unique_checks   uniqueness checks while removing numbers
+    deduced         empty cells the search filled by deduction alone, before its first guess
+
+Phases are 'fill', 'remove' and 'verify', where verify is the time of the uniqueness checks
+and is included in remove.
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+
+COUNTERS = ('nodes', 'backtracks', 'checks', 'unique_checks', 'deduced')
+
+_NO_PHASE = nullcontext()
+
+
+class Stats:
+    """counters and phase timers, callback is called with (phase, seconds, stats) when a phase ends"""
+
+    __slots__ = COUNTERS + ('timers', 'callback')
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        """sets counters and timers to zero"""
+        self.nodes = 0
+        self.backtracks = 0
+        self.checks = 0
+        self.unique_checks = 0
+        self.deduced = 0
+        self.timers = {}  # phase -> seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """times the block as phase, time is added to earlier runs of the same phase"""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - start
+            self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+            if self.callback is not None:
+                self.callback(name, seconds, self)
+
+    def add(self, other: 'Stats'):
+        """adds counters and timers of other stats, e.g. from worker processes"""
+        for name in COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+        for name, seconds in other.timers.items():
+            self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def as_dict(self) -> dict:
+        return {**{name: getattr(self, name) for name in COUNTERS}, 'timers': dict(self.timers)}
+
+    def __getstate__(self) -> dict:
+        # callback is left out, it is often a lambda that cannot be pickled
+        return self.as_dict()
+
+    def __setstate__(self, state: dict):
+        self.callback = None
+        self.reset()
+        for name in COUNTERS:
+            setattr(self, name, state[name])
+        self.timers.update(state['timers'])
+
+    def __repr__(self) -> str:
+        counters = ', '.join(f'{name}={getattr(self, name)}' for name in COUNTERS)
+        timers = ', '.join(f'{name}={seconds * 1000:.3f}ms' for name, seconds in self.timers.items())
+        return f'Stats({counters}, timers={{{timers}}})'
+
+
+def phase(stats: Stats | None, name: str):
+    """returns stats.phase(name), or a context that does nothing if stats is None"""
+    return _NO_PHASE if stats is None else stats.phase(name)
+
+
+@contextmanager
+def profile(path: str = None):
+    """
+    runs the block under cProfile and yields the profiler, profile is saved to path if given.
+    Read it with pstats.Stats(path) or pstats.Stats(profiler)
+    """
+    import cProfile  # imported only when profiling
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+
+        if path is not None:
+            profiler.dump_stats(path)
@@ -0,0 +1,261 @@
+"""
+On-disk store of generated SUDOKU puzzles where equivalent puzzles are kept only once.
+
+Two puzzles are equivalent when one is made from the other by relabelling the digits, swapping
+rows inside a band, swapping bands, swapping columns inside a stack, swapping stacks or
+transposing. Every puzzle is saved under its canonical form, the smallest of all its
+equivalent puzzles, so an equivalent puzzle is found with one primary key lookup.
+
+Canonical form is found through the solution, which has all digits on every row:
+    1. digits are relabelled so that the top row is 123456789, so only rows and columns are left
+    2. second row is minimized over top rows, second rows and the 1296 column orders,
+       only the column orders that put a number of the second row to the first column of the
+       second stack can win, which leaves 216 orders to try
+    3. rest of the rows are sorted, bands by their rows
+    4. if solution has symmetries, the smallest puzzle of the tied transformations is taken
+
+Puzzles are saved to SQLite as packed records (Sudoku_io) together with their seed and level.
+Every puzzle is handed out only once, so many processes can serve from the same file.
+
+    python Sudoku_server.py store puzzles.db 100000 --difficulty hard
+"""
+
+import itertools
+import sqlite3
+from functools import partial
+
+import Sudoku_dlx
+import Sudoku_grader
+from Sudoku_batch import imap_windowed, iter_seeds, make_record
+from Sudoku_engine import SIZE, from_string
+from Sudoku_io import pack_record, unpack_record
+
+_PERMUTATIONS = tuple(itertools.permutations(range(3)))
+
+
+def _column_orders() -> dict[tuple[int, int], list[tuple[bytes, bytes]]]:
+    """
+    returns all column orders as (order, position table) grouped by their columns at positions 0 and 3.
+    order[j] is the column put to position j and position table maps column to its new position
+    """
+    groups = {}
+
+    for stacks in _PERMUTATIONS:
+        for inner in itertools.product(_PERMUTATIONS, repeat=3):
+            order = bytes(stack * 3 + inner[k][i] for k, stack in enumerate(stacks) for i in range(3))
+
+            positions = bytearray(256)  # table for bytes.translate
+            for j, col in enumerate(order):
+                positions[col] = j
+
+            groups.setdefault((order[0], order[3]), []).append((order, bytes(positions)))
+
+    return groups
+
+
+COLUMN_ORDERS = _column_orders()
+
+
+def canonical(puzzle: list[int], solution: list[int]) -> tuple[bytes, bytes]:
+    """returns canonical form of the puzzle and its solution as 81 bytes each, equivalent puzzles get the same form"""
+    best = None
+    candidates = []  # (transposed, top row, second row, column order) giving the best second row
+
+    for transposed in (False, True):
+        grid = solution if not transposed else [solution[col * SIZE + row] for row in range(SIZE) for col in range(SIZE)]
+        rows = [grid[row * SIZE:row * SIZE + SIZE] for row in range(SIZE)]
+
+        for top in range(SIZE):
+            column_of = [0] * (SIZE + 1)  # column of every digit on the top row
+            for col, number in enumerate(rows[top]):
+                column_of[number] = col
+
+            band = top // 3 * 3
+            for second in range(band, band + 3):
+                if second == top:
+                    continue
+
+                # second row as columns of its digits on the top row, relabelled second row is this
+                # in the new column order, mapped to new positions
+                moves = bytes(column_of[number] for number in rows[second]) + bytes(256 - SIZE)
+
+                # first number of the second row can always be made 3 (0 based), by putting its
+                # column first in the second stack
+                for first in range(SIZE):
+                    for order, positions in COLUMN_ORDERS[first, moves[first]]:
+                        row = order.translate(moves).translate(positions)
+
+                        if best is None or row < best:
+                            best = row
+                            candidates = [(transposed, top, second, order)]
+                        elif row == best:
+                            candidates.append((transposed, top, second, order))
+
+    result = None
+    for transposed, top, second, order in candidates:
+        form = _transformed(puzzle, solution, transposed, top, second, order)
+
+        if result is None or form < result:
+            result = form
+
+    return result[1], result[0]
+
+
+def _transformed(puzzle, solution, transposed, top, second, order) -> tuple[bytes, bytes]:
+    """returns (solution, puzzle) with rows and digits put to the canonical order for the given top rows and column order"""
+
+    def cell(row, col):
+        return col * SIZE + row if transposed else row * SIZE + col
+
+    labels = bytearray(SIZE + 1)
+    for j, col in enumerate(order):
+        labels[solution[cell(top, col)]] = j + 1
+
+    def relabelled(row):
+        return bytes(labels[solution[cell(row, col)]] for col in order), row
+
+    band = top // 3
+    third = band * 9 + 3 - top - second  # rows of a band add up to band * 9 + 3
+
+    rows = [relabelled(top), relabelled(second), relabelled(third)]
+    bands = sorted(sorted(relabelled(row) for row in range(other * 3, other * 3 + 3)) for other in range(3) if other != band)
+    rows += bands[0] + bands[1]
+
+    new_solution = b''.join(numbers for numbers, _ in rows)
+    new_puzzle = bytes(
+        new_solution[i * SIZE + j] if puzzle[cell(row, col)] else 0
+        for i, (_, row) in enumerate(rows) for j, col in enumerate(order)
+    )
+
+    return new_solution, new_puzzle
+
+
+def canonical_key(puzzle: list[int], solution: list[int]) -> bytes:
+    """returns canonical form packed to a record, used as the key of the store"""
+    puzzle, solution = canonical(puzzle, solution)
+    return pack_record(list(puzzle), list(solution))
+
+
+def make_entry(seed: int, difficulty: str = None) -> tuple:
+    """generates puzzle and returns (key, packed record, seed, level) row for the store"""
+    record = make_record(seed, difficulty)
+    puzzle, solution = from_string(record.puzzle), from_string(record.solution)
+
+    return canonical_key(puzzle, solution), pack_record(puzzle, solution), seed, Sudoku_grader.grade(puzzle).level
+
+
+# ---------------------------
+# Store
+# ---------------------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    key BLOB PRIMARY KEY,           -- canonical form as packed record
+    record BLOB NOT NULL,           -- puzzle as generated as packed record
+    seed INTEGER,                   -- seed as signed 64-bit
+    level TEXT NOT NULL,            -- difficulty from Sudoku_grader
+    served INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ready ON puzzles (served, level);
+"""
+
+
+def _to_signed(seed: int | None) -> int | None:
+    # SQLite integers are signed 64-bit, seeds are unsigned
+    return seed - (1 << 64) if seed is not None and seed >= 1 << 63 else seed
+
+
+def _to_unsigned(seed: int | None) -> int | None:
+    return seed + (1 << 64) if seed is not None and seed < 0 else seed
+
+
+class PuzzleStore:
+    """SQLite store of unique puzzles, can be used as context manager"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')  # readers do not block the writer
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'PuzzleStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM puzzles').fetchone()[0]
+
+    def add(self, puzzle: list[int], solution: list[int], seed: int = None, level: str = None) -> bool:
+        """adds puzzle given as flat lists, returns False if it or an equivalent puzzle is stored already"""
+        level = level or Sudoku_grader.grade(puzzle).level
+        entry = (canonical_key(puzzle, solution), pack_record(puzzle, solution), seed, level)
+
+        return self.add_many([entry]) == 1
+
+    def add_many(self, entries) -> int:
+        """adds (key, record, seed, level) rows from make_entry, returns number of new puzzles"""
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO puzzles (key, record, seed, level) VALUES (?, ?, ?, ?)',
+                ((key, record, _to_signed(seed), level) for key, record, seed, level in entries),
+            )
+
+            return self.connection.total_changes - before
+
+    def contains(self, puzzle: list[int], solution: list[int] = None) -> bool:
+        """if puzzle or an equivalent puzzle is stored, solution is solved if not given"""
+        if solution is None:
+            solution = Sudoku_dlx.solve(puzzle)
+            if solution is None:
+                return False
+
+        key = canonical_key(puzzle, solution)
+        return self.connection.execute('SELECT 1 FROM puzzles WHERE key = ?', (key,)).fetchone() is not None
+
+    def take(self, level: str = None) -> tuple[list[int], list[int], int] | None:
+        """
+        returns (puzzle, solution, seed) of a puzzle that has not been served yet and marks it served,
+        any level if not given. Returns None if the store has run out of such puzzles
+        """
+        with self.connection:
+            row = self.connection.execute(
+                'UPDATE puzzles SET served = 1 WHERE key = ('
+                ' SELECT key FROM puzzles WHERE served = 0 AND (?1 IS NULL OR level = ?1) LIMIT 1'
+                ') RETURNING record, seed',
+                (level,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        puzzle, solution = unpack_record(row[0])
+        return puzzle, solution, _to_unsigned(row[1])
+
+    def stats(self) -> dict:
+        """returns number of stored and served puzzles of every level"""
+        stats = {}
+        for level, stored, served in self.connection.execute(
+                'SELECT level, COUNT(*), SUM(served) FROM puzzles GROUP BY level'):
+            stats[level] = {'stored': stored, 'served': served}
+
+        return stats
+
+    def fill(self, n: int, workers: int = None, seed: int = None, difficulty: str = None, chunk: int = 1024) -> int:
+        """
+        generates n puzzles on a pool of worker processes and adds them, returns number of new puzzles.
+        Canonical forms are found in the workers as well
+        """
+        seeds = itertools.islice(iter_seeds(seed), n)
+        entries = imap_windowed(partial(make_entry, difficulty=difficulty), seeds, workers)
+
+        added = 0
+        while block := list(itertools.islice(entries, chunk)):
+            added += self.add_many(block)
+
+        return added
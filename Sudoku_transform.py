@@ -0,0 +1,131 @@
+"""
+Validity preserving transformations of SUDOKU puzzles.
+
+Relabelling digits, swapping bands or stacks, swapping rows inside a band or columns inside a
+stack and transposing map a valid grid to a valid grid, and a puzzle with one solution to a
+puzzle with one solution. Rotations and mirrors are combinations of these. Together they give
+2 * 6^8 * 9! (about 1.2e12) transformations, so one generated puzzle gives practically endless
+new looking puzzles in microseconds each, without solving anything again.
+Sudoku_store sees transformed puzzles as equivalent to the original. Other board sizes are
+transformed the same way, give their box size n.
+
+    transform = random_transform(Random(seed))
+    new_puzzle, new_solution = transform(puzzle), transform(solution)
+"""
+
+from math import isqrt
+from operator import itemgetter
+from random import Random
+
+from Sudoku_engine import CELLS, SIZE, geometry_for
+
+_DIGITS = bytes(range(256))  # bytes.translate table that keeps every digit
+
+
+class Transform:
+    """transformation of flat lists of 81 cells, empty cells stay empty"""
+
+    __slots__ = ('source', 'digits', '_take')
+
+    def __init__(self, source=tuple(range(CELLS)), digits: bytes = _DIGITS):
+        self.source = tuple(source)  # source[i] is the cell moved to cell i
+        self.digits = digits  # bytes.translate table from old to new digit
+        self._take = itemgetter(*self.source)
+
+    def __call__(self, cells) -> list[int]:
+        """returns transformed copy of the cells"""
+        return list(bytes(self._take(cells)).translate(self.digits))
+
+    def then(self, other: 'Transform') -> 'Transform':
+        """returns transformation that does this one and then other"""
+        return Transform(other._take(self.source), self.digits.translate(other.digits))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Transform) and self.source == other.source and self.digits == other.digits
+
+    def __repr__(self) -> str:
+        size = isqrt(len(self.source))
+        return f'Transform(source={self.source!r}, digits={list(self.digits[1:size + 1])!r})'
+
+
+def _check_lines(lines, n: int, name: str):
+    """raises ValueError if lines are not a permutation that keeps every line in its band or stack"""
+    if sorted(lines) != list(range(n * n)):
+        raise ValueError(f'{name} must be a permutation of 0 - {n * n - 1}, got {lines!r}')
+
+    for start in range(0, n * n, n):
+        if len({line // n for line in lines[start:start + n]}) != 1:
+            raise ValueError(f'{name} must move whole bands and stacks, got {lines!r}')
+
+
+def make(rows=None, cols=None, digits=None, transpose: bool = False, n: int = 3) -> Transform:
+    """
+    makes transformation of the board of n x n boxes where row rows[r] is moved to row r, col cols[c]
+    to col c and digit d becomes digits[d - 1], then the grid is transposed if transpose is set.
+    Raises ValueError if rows or cols would move a line out of its band or stack
+    """
+    size = n * n
+    rows = list(range(size)) if rows is None else list(rows)
+    cols = list(range(size)) if cols is None else list(cols)
+    _check_lines(rows, n, 'rows')
+    _check_lines(cols, n, 'cols')
+
+    if digits is not None and sorted(digits) != list(range(1, size + 1)):
+        raise ValueError(f'digits must be a permutation of 1 - {size}, got {digits!r}')
+
+    return _make(rows, cols, digits, transpose)
+
+
+def _make(rows: list[int], cols: list[int], digits, transpose: bool) -> Transform:
+    """makes transformation from lines and digits that are known to be valid"""
+    size = len(rows)
+    table = bytearray(_DIGITS)
+    if digits is not None:
+        table[1:size + 1] = bytes(digits)
+
+    starts = [row * size for row in rows]
+    source = [start + col for start in starts for col in cols]
+
+    if transpose:
+        source = [source[col * size + row] for row in range(size) for col in range(size)]
+
+    return Transform(source, bytes(table))
+
+
+def _shuffled_lines(rng: Random, n: int) -> list[int]:
+    """returns lines with the bands (or stacks) shuffled and lines shuffled inside them"""
+    bands = list(range(n))
+    rng.shuffle(bands)
+
+    lines = []
+    for band in bands:
+        inner = list(range(band * n, band * n + n))
+        rng.shuffle(inner)
+        lines += inner
+
+    return lines
+
+
+def random_transform(rng: Random, n: int = 3) -> Transform:
+    """returns transformation of the board of n x n boxes drawn evenly from all of them"""
+    digits = list(range(1, n * n + 1))
+    rng.shuffle(digits)
+
+    return _make(_shuffled_lines(rng, n), _shuffled_lines(rng, n), digits, rng.random() < 0.5)
+
+
+def variants(puzzle: list[int], solution: list[int], seed: int = None):
+    """yields endless (puzzle, solution) transformations of the puzzle, same seed gives the same ones"""
+    rng = Random(seed)
+    n = geometry_for(len(puzzle)).box
+
+    while True:
+        transform = random_transform(rng, n)
+        yield transform(puzzle), transform(solution)
+
+
+IDENTITY = Transform()
+TRANSPOSE = make(transpose=True)
+MIRROR = make(cols=range(SIZE - 1, -1, -1))  # left to right
+FLIP = make(rows=range(SIZE - 1, -1, -1))  # upside down
+ROTATE = TRANSPOSE.then(MIRROR)  # 90 degrees clockwise
@@ -0,0 +1,89 @@
+"""
+Vectorized validation of many SUDOKU grids at once with NumPy.
+
+Every number is turned to a bit (1 << number). A row, column or nonet has no duplicates when
+the sum of its bits equals their bitwise or, so all units of all boards are checked with a few
+array reductions and no Python loop per board. Conflicting cells are located only for the
+boards that fail, by counting numbers on one-hot arrays (board, row, col, number).
+NumPy is needed only for this module.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # validate_many is not available without numpy
+    np = None
+
+CHUNK = 65536  # boards validated at a time, one-hot array of a chunk takes ~48 MB
+
+
+def validate_many(grids, require_complete: bool = False, chunk: int = CHUNK):
+    """
+    validates (N, 9, 9) array of grids, empty cells are 0.
+    Returns boolean vector (N,) of valid boards and boolean array (N, 9, 9) of conflicting cells,
+    np.argwhere(conflicts[n]) gives (row, col) of conflicts of board n.
+    Like SUDOKU.validate_sudoku empty cells are allowed unless require_complete is set
+    """
+    if np is None:
+        raise ImportError('validate_many needs numpy, install it with "pip install numpy"')
+
+    grids = np.asarray(grids)
+    if grids.ndim == 2:
+        grids = grids.reshape(1, 9, 9)
+
+    if grids.shape[1:] != (9, 9):
+        raise ValueError(f'Grids must have shape (N, 9, 9), got {grids.shape}')
+
+    valid = np.empty(len(grids), dtype=bool)
+    for start in range(0, len(grids), chunk):
+        valid[start:start + chunk] = _valid(grids[start:start + chunk])
+
+    conflicts = np.zeros(grids.shape, dtype=bool)
+    invalid = np.flatnonzero(~valid)
+    for start in range(0, len(invalid), chunk):
+        boards = invalid[start:start + chunk]
+        conflicts[boards] = _conflicts(grids[boards])
+
+    if require_complete:
+        valid &= (grids != 0).all(axis=(1, 2))
+
+    return valid, conflicts
+
+
+def _valid(grids):
+    """returns (N,) array of boards that have no duplicates in any row, column or nonet"""
+    n = len(grids)
+    in_range = ((grids >= 0) & (grids <= 9)).all(axis=(1, 2))
+
+    # empty cells give bit 0, which is masked out
+    bits = np.left_shift(1, np.clip(grids, 0, 9), dtype=np.int16) & 0x3FE
+
+    rows = bits
+    cols = bits.transpose(0, 2, 1)
+    boxes = bits.reshape(n, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(n, 9, 9)
+
+    valid = in_range
+    for units in (rows, cols, boxes):
+        valid &= (units.sum(axis=2) == np.bitwise_or.reduce(units, axis=2)).all(axis=1)
+
+    return valid
+
+
+def _conflicts(grids):
+    """returns (N, 9, 9) array of cells that share a number with a cell in its row, column or nonet"""
+    n = len(grids)
+    one_hot = grids[..., None] == np.arange(1, 10, dtype=grids.dtype)  # (N, row, col, number)
+
+    # count every number in every row, column and nonet
+    row_duplicates = one_hot.sum(axis=2, dtype=np.int8) > 1  # (N, row, number)
+    col_duplicates = one_hot.sum(axis=1, dtype=np.int8) > 1  # (N, col, number)
+    box_duplicates = one_hot.reshape(n, 3, 3, 3, 3, 9).sum(axis=(2, 4), dtype=np.int8) > 1  # (N, band, stack, number)
+
+    # spread duplicates back to cells
+    duplicates = (
+        row_duplicates[:, :, None, :]
+        | col_duplicates[:, None, :, :]
+        | box_duplicates.repeat(3, axis=1).repeat(3, axis=2)
+    )
+
+    # numbers outside 0 - 9 are conflicts as well
+    return (one_hot & duplicates).any(axis=-1) | (grids < 0) | (grids > 9)
@@ -0,0 +1,52 @@
+"""
+Import time benchmark for the headless engine compared to the PyQt5 user interface.
+
+Every import runs in a fresh interpreter, so nothing is cached between the runs.
+
+    python benchmarks/import_time.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNS = 20
+IMPORTS = {
+    'interpreter only': 'pass',
+    'headless engine': 'import Sudoku_core',
+    'server module': 'import Sudoku_server',
+    'PyQt5 user interface': 'import Sudoku_gui',
+}
+
+
+def time_import(code: str, runs: int) -> float:
+    """returns median wall time in seconds of running code in a new interpreter"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def main(runs: int = RUNS) -> int:
+    results = {name: time_import(code, runs) for name, code in IMPORTS.items()}
+    base = results['interpreter only']
+    gui = results['PyQt5 user interface']
+
+    print(f'{"import":<24} {"median ms":>10} {"import ms":>10}')
+    for name, seconds in results.items():
+        print(f'{name:<24} {seconds * 1000:>10.1f} {(seconds - base) * 1000:>10.1f}')
+
+    engine = results['headless engine'] - base
+    print(f'\nheadless engine imports {(gui - base) / engine:.1f}x faster than the user interface')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else RUNS))
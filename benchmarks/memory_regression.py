@@ -0,0 +1,72 @@
+"""
+Regression benchmark for repeated SUDOKU.generate() calls.
+
+Generates puzzles again and again on one instance and checks that memory held by the
+instance and time per generate() stay flat, e.g. nothing is collected between games.
+
+    python benchmarks/memory_regression.py [generations]
+"""
+
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Sudoku_core import SUDOKU  # noqa: E402
+
+GENERATIONS = 10_000
+WARMUP = 100
+MEMORY_TOLERANCE = 64 * 1024  # bytes
+TIME_TOLERANCE = 1.5  # allowed slowdown of the last window median compared to the first
+
+
+def main(generations: int = GENERATIONS) -> int:
+    """runs the benchmark and returns exit code, 1 if memory or time grows"""
+    sudoku = SUDOKU()
+    window = max(generations // 10, 1)
+
+    for _ in range(WARMUP):
+        sudoku.generate()
+
+    # timings are allocated up front so they are not counted as growth
+    timings = array('d', bytes(8 * generations))
+
+    # recursive search helpers leave reference cycles behind, count only what survives a collection
+    gc.collect()
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+
+    for i in range(generations):
+        start = time.perf_counter()
+        sudoku.generate()
+        timings[i] = time.perf_counter() - start
+
+    gc.collect()
+    end_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    first = statistics.median(timings[:window])
+    last = statistics.median(timings[-window:])
+    growth = end_memory - start_memory
+
+    print(f'generations:      {generations}')
+    print(f'memory growth:    {growth} bytes')
+    print(f'first {window} median: {first * 1000:.3f} ms')
+    print(f'last {window} median:  {last * 1000:.3f} ms')
+
+    # a second instance must not share state with the first
+    other = SUDOKU()
+    shared = other.solution is sudoku.solution
+
+    failed = growth > MEMORY_TOLERANCE or last > first * TIME_TOLERANCE or shared
+    print('FAIL' if failed else 'OK')
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else GENERATIONS))
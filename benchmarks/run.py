@@ -0,0 +1,226 @@
+"""
+Benchmark suite for the SUDOKU engine.
+
+Runs seeded workloads headless (no PyQt import) and reports throughput, p50/p99 latency and
+peak traced memory for each of them. Results are saved as JSON so runs can be compared.
+
+    python benchmarks/run.py                          run all workloads
+    python benchmarks/run.py generate solve-dlx       run only given workloads
+    python benchmarks/run.py -o new.json --compare old.json
+    python benchmarks/run.py generate --profile profiles   cProfile of every workload to profiles/
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from random import Random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Sudoku_dlx  # noqa: E402
+from Sudoku_engine import Board, count_solutions, from_string, generate, solve  # noqa: E402
+from Sudoku_stats import profile  # noqa: E402
+from Sudoku_transform import random_transform  # noqa: E402
+from Sudoku_validate import np, validate_many  # noqa: E402
+
+# well known hard puzzles, all have exactly one solution
+HARD_PUZZLES = [
+    '800000000003600000070090200050007000000045700000100030001000068008500010090000400',
+    '000000010400000000020000000000050407008000300001090000300400200050100000000806000',
+    '100007090030020008009600500005300900010080002600004000300000010040000007007000300',
+    '000000039000001005003050800008090006070002000100400000009080050020000600400700000',
+    '1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..',
+    '..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9',
+    '1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1',
+    '12.3....435....1....4........54..2..6...7.........8.9...31..5.......9.7.....6...8',
+    '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+    '52...6.........7.13...........4..8..6......5...........418.........3..2...87.....',
+    '6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....',
+    '48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....',
+]
+
+MEMORY_SAMPLES = 10  # operations run again under tracemalloc to find peak memory
+
+
+# ---------------------------
+# Workloads
+# ---------------------------
+# every workload returns list of operations (callables without arguments)
+
+def workload_generate(rng: Random, n: int) -> list:
+    """generates puzzles from seeds"""
+    return [lambda seed=rng.getrandbits(64): generate(seed) for _ in range(n)]
+
+
+def workload_generate_16(rng: Random, n: int) -> list:
+    """generates 16 x 16 puzzles, uniqueness checks are capped so time per puzzle stays bounded"""
+    return [lambda seed=rng.getrandbits(64): generate(seed, 4) for _ in range(n)]
+
+
+def workload_generate_25(rng: Random, n: int) -> list:
+    """generates 25 x 25 puzzles"""
+    return [lambda seed=rng.getrandbits(64): generate(seed, 5) for _ in range(n)]
+
+
+def workload_transform(rng: Random, n: int) -> list:
+    """makes new puzzles by shuffling a generated one, compare with generate"""
+    puzzle, solution = generate(rng.getrandbits(64))
+
+    def operation(seed):
+        transform = random_transform(Random(seed))
+        return transform(puzzle), transform(solution)
+
+    return [lambda seed=rng.getrandbits(64): operation(seed) for _ in range(n)]
+
+
+def workload_solve_backtrack(rng: Random, n: int) -> list:
+    """solves hard puzzles with the backtracking solver"""
+    return [lambda cells=from_string(rng.choice(HARD_PUZZLES)): solve(Board(cells)) for _ in range(n)]
+
+
+def workload_solve_dlx(rng: Random, n: int) -> list:
+    """solves hard puzzles with the dancing links solver"""
+    return [lambda cells=from_string(rng.choice(HARD_PUZZLES)): Sudoku_dlx.solve(cells) for _ in range(n)]
+
+
+def workload_count(rng: Random, n: int) -> list:
+    """checks uniqueness of generated puzzles with early cutoff"""
+    puzzles = [generate(rng.getrandbits(64))[0] for _ in range(min(n, 50))]
+    return [lambda board=Board(rng.choice(puzzles)): count_solutions(board, limit=2) for _ in range(n)]
+
+
+def workload_validate(rng: Random, n: int) -> list:
+    """validates batches of 1000 solved grids, one operation per batch"""
+    solutions = [generate(rng.getrandbits(64))[1] for _ in range(20)]
+    batches = [[rng.choice(solutions) for _ in range(1000)] for _ in range(n)]
+
+    if np is None:
+        return [lambda batch=batch: [Board(cells) for cells in batch] for batch in batches]
+
+    arrays = [np.array(batch, dtype=np.int8).reshape(-1, 9, 9) for batch in batches]
+    return [lambda grids=grids: validate_many(grids) for grids in arrays]
+
+
+WORKLOADS = {
+    'generate': (workload_generate, 200),
+    'generate-16': (workload_generate_16, 10),
+    'generate-25': (workload_generate_25, 3),
+    'transform': (workload_transform, 2000),
+    'solve-backtrack': (workload_solve_backtrack, 50),
+    'solve-dlx': (workload_solve_dlx, 200),
+    'count': (workload_count, 500),
+    'validate': (workload_validate, 50),
+}
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+
+def percentile(values: list[float], percent: float) -> float:
+    """returns percentile of sorted values"""
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def run_workload(name: str, seed: int, n: int = None, profile_dir: str = None) -> dict:
+    """runs workload and returns its results, operations are profiled to profile_dir if given"""
+    make, default_n = WORKLOADS[name]
+    operations = make(Random(seed), n or default_n)
+
+    timings = []
+    start = time.perf_counter()
+    for operation in operations:
+        op_start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - op_start)
+    total = time.perf_counter() - start
+
+    # peak memory is measured separately, tracemalloc slows down the timings
+    tracemalloc.start()
+    for operation in operations[:MEMORY_SAMPLES]:
+        operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # profiled separately as well, cProfile slows down the timings even more
+    if profile_dir is not None:
+        with profile(os.path.join(profile_dir, f'{name}.prof')):
+            for operation in operations:
+                operation()
+
+    timings.sort()
+    return {
+        'operations': len(timings),
+        'total_s': total,
+        'throughput_per_s': len(timings) / total,
+        'mean_ms': statistics.fmean(timings) * 1000,
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'peak_memory_bytes': peak,
+    }
+
+
+def compare(results: dict, baseline: dict):
+    """prints change of results compared to baseline results"""
+    print('\ncompared to baseline:')
+    for name, result in results['workloads'].items():
+        old = baseline.get('workloads', {}).get(name)
+        if old is None:
+            continue
+
+        print(f'  {name:<16} throughput {result["throughput_per_s"] / old["throughput_per_s"]:6.2f}x'
+              f'  p99 {result["p99_ms"] / old["p99_ms"]:6.2f}x')
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description='SUDOKU engine benchmarks')
+    parser.add_argument('workloads', nargs='*', help=f'workloads to run, all by default: {", ".join(WORKLOADS)}')
+    parser.add_argument('-n', type=int, help='operations per workload, workload default if not given')
+    parser.add_argument('-s', '--seed', type=int, default=2023)
+    parser.add_argument('-o', '--output', help='save results as JSON')
+    parser.add_argument('--compare', help='JSON results of an earlier run')
+    parser.add_argument('--profile', metavar='DIR', help='save cProfile of every workload to DIR/<workload>.prof')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f'unknown workloads: {", ".join(sorted(unknown))}')
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'workloads': {},
+    }
+
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+
+    print(f'{"workload":<16} {"ops":>6} {"ops/s":>10} {"p50 ms":>10} {"p99 ms":>10} {"peak KiB":>10}')
+    for name in args.workloads or WORKLOADS:
+        result = run_workload(name, args.seed, args.n, args.profile)
+        results['workloads'][name] = result
+        print(f'{name:<16} {result["operations"]:>6} {result["throughput_per_s"]:>10.1f} {result["p50_ms"]:>10.3f}'
+              f' {result["p99_ms"]:>10.3f} {result["peak_memory_bytes"] / 1024:>10.1f}')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
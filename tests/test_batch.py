@@ -0,0 +1,69 @@
+import io
+from collections import Counter
+
+import pytest
+
+from Sudoku_batch import generate_batch, make_record, puzzle_seeds, solve_puzzles, solve_record, write_solved
+from Sudoku_engine import Board, count_solutions, from_string, generate, to_string
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_generated_puzzle_is_unique_and_solved(seed):
+    puzzle, solution = generate(seed)
+
+    assert count_solutions(Board(puzzle), 2) == 1
+    assert 0 not in solution and Board(solution).cells == solution  # no duplicates
+    assert all(not number or number == solution[i] for i, number in enumerate(puzzle))
+
+
+def test_generate_is_deterministic():
+    assert generate(5) == generate(5)
+    assert generate(5) != generate(6)
+    assert make_record(5) == make_record(5)
+
+
+def test_to_and_from_string():
+    puzzle, _ = generate(3)
+    assert from_string(to_string(puzzle)) == puzzle
+
+    with pytest.raises(ValueError):
+        from_string('1' * 80)
+
+
+def test_batch_is_the_same_on_any_number_of_workers():
+    records = generate_batch(6, workers=1, seed=1)
+
+    assert [record.seed for record in records] == puzzle_seeds(1, 6)
+    assert generate_batch(6, workers=2, seed=1, chunksize=1) == records
+    assert all(record == make_record(record.seed) for record in records)
+
+
+def test_solve_statuses():
+    record = make_record(2)
+    solved = solve_record(record.puzzle)
+    assert (solved.status, solved.solution) == ('unique', record.solution)
+
+    cells = from_string(record.solution)
+    cells[:18] = [0] * 18  # top two rows of a band can be swapped
+    assert solve_record(to_string(cells)).status == 'multiple'
+    assert solve_record('.' * 81).status == 'multiple'
+
+    dead = [0] * 81
+    dead[:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+    dead[17] = 9
+    assert solve_record(to_string(dead)).status == 'unsolvable'
+
+    assert solve_record('11' + '.' * 79).status == 'invalid'
+    assert solve_record('abc').status == 'invalid'
+
+
+def test_solved_file_keeps_the_input_order():
+    puzzles = [make_record(seed).puzzle for seed in range(5)] + ['abc']
+    file = io.StringIO()
+    statuses = write_solved(file, solve_puzzles(iter(puzzles), workers=2, chunksize=1), chunk=2)
+
+    assert statuses == Counter(unique=5, invalid=1)
+    lines = file.getvalue().splitlines()
+    assert [line.split()[0] for line in lines] == puzzles
+    assert lines[-1].split()[1:3] == ['-', 'invalid']
+    assert [line.split()[1] for line in lines[:5]] == [make_record(seed).solution for seed in range(5)]
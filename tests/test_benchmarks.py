@@ -0,0 +1,31 @@
+import importlib.util
+import json
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load(name: str):
+    spec = importlib.util.spec_from_file_location(f'benchmarks_{name}', os.path.join(ROOT, 'benchmarks', f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_workloads_run_and_compare(tmp_path, capsys):
+    run = load('run')
+    first, second = str(tmp_path / 'first.json'), str(tmp_path / 'second.json')
+    workloads = ['generate', 'solve-dlx', 'count']
+
+    assert run.main([*workloads, '-n', '2', '-o', first]) == 0
+    assert run.main([*workloads, '-n', '2', '-o', second, '--compare', first]) == 0
+
+    with open(second) as file:
+        results = json.load(file)
+
+    assert list(results['workloads']) == workloads
+    for result in results['workloads'].values():
+        assert result['operations'] == 2 and result['throughput_per_s'] > 0
+        assert result['p50_ms'] <= result['p99_ms']
+
+    assert 'generate' in capsys.readouterr().out
@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+import Sudoku_dlx
+from Sudoku_core import SUDOKU
+from Sudoku_engine import Board, Budget, generate, search, solve
+from Sudoku_grader import generate as generate_level
+
+
+def test_node_budget_cuts_the_search():
+    budget = Budget(max_nodes=5)
+    result = search(Board(), 0, budget)
+
+    assert not result.complete
+    assert budget.exhausted == 'nodes' and budget.nodes == 5
+
+
+def test_deadline_cuts_the_search():
+    budget = Budget(seconds=0)
+    result = search(Board(), 0, budget)
+
+    assert not result.complete and budget.exhausted == 'deadline'
+
+
+def test_budget_is_shared_by_the_calls():
+    puzzle, solution = generate(1)
+    budget = Budget(max_nodes=10 ** 6)
+
+    assert solve(Board(puzzle), budget=budget) == solution
+    spent = budget.nodes
+    assert Sudoku_dlx.solve(puzzle, budget=budget) == solution
+    assert budget.nodes > spent and budget.exhausted is None
+
+
+def test_cancel_token_set_before_the_call_is_seen():
+    puzzle, _ = generate(1)
+    cancel = threading.Event()
+    cancel.set()
+
+    for find in (lambda budget: solve(Board(puzzle), budget=budget),
+                 lambda budget: Sudoku_dlx.solve(puzzle, budget=budget)):
+        budget = Budget(cancel=cancel)
+        assert find(budget) is None
+        assert budget.exhausted == 'cancelled'
+
+
+def test_budget_running_out_in_fill_keeps_the_game():
+    sudoku = SUDOKU(seed=1)
+    before = sudoku.Puzzle.copy()
+
+    for box in (3, 4):
+        sudoku.box = box
+        with pytest.raises(ValueError):
+            sudoku.generate(seed=9, budget=Budget(max_nodes=10))
+
+    assert sudoku.Puzzle == before
+
+
+def test_budget_running_out_while_removing_cuts_the_puzzle_short():
+    full, _ = generate(3)
+    puzzle, solution = generate(3, budget=Budget(max_nodes=150))  # fill takes ~130
+
+    assert puzzle.count(0) < full.count(0)
+    assert Sudoku_dlx.count(puzzle, 2) == 1 and Sudoku_dlx.solve(puzzle) == solution
+
+
+def test_level_is_never_missed_quietly():
+    with pytest.raises(ValueError, match='Budget'):
+        generate_level(1, 'hard', budget=Budget(max_nodes=50))
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+from random import Random
+
+from Sudoku_core import SUDOKU
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_games_do_not_share_state():
+    first, second = SUDOKU(seed=1), SUDOKU(seed=2)
+    solution = first.solution.copy()
+
+    second.generate(3)
+    assert first.solution == solution
+    assert first.solution is not second.solution
+    assert not hasattr(SUDOKU, 'search_path')
+
+
+def test_repeated_generate_holds_only_the_current_game():
+    sudoku = SUDOKU(seed=1)
+    for seed in range(20):
+        sudoku.generate(seed)
+
+    assert sudoku.Puzzle == SUDOKU(seed=19).Puzzle
+    assert sorted(vars(sudoku)) == sorted(vars(SUDOKU(seed=19)))
+
+
+def test_same_seed_gives_the_same_game():
+    assert SUDOKU(seed=5).Puzzle == SUDOKU(seed=5).Puzzle
+    assert SUDOKU(seed=5).Puzzle != SUDOKU(seed=6).Puzzle
+
+    game = SUDOKU(seed=5)
+    game.generate()  # seed drawn from the rng
+    again = SUDOKU(seed=game.ID)
+    assert again.Puzzle == game.Puzzle and again.solution == game.solution
+
+
+def test_injected_rng_draws_the_seeds():
+    first = SUDOKU(rng=Random(7))
+    second = SUDOKU(rng=Random(7))
+
+    assert first.ID == second.ID and first.Puzzle == second.Puzzle
+    first.generate()
+    second.generate()
+    assert first.Puzzle == second.Puzzle
+
+
+def test_core_does_not_import_the_interface():
+    code = 'import sys, Sudoku_core; sys.exit(any(name in sys.modules for name in ("PyQt5", "termcolor", "numpy")))'
+    assert subprocess.run([sys.executable, '-c', code], cwd=ROOT).returncode == 0
@@ -0,0 +1,51 @@
+from random import Random
+
+import pytest
+
+import Sudoku_dlx
+from Sudoku_core import SUDOKU
+from Sudoku_engine import Board, count_solutions
+
+
+def holed(seed: int, holes: int) -> list[int]:
+    """returns solution of a game with random cells emptied, often with many solutions"""
+    rng = Random(seed)
+    cells = list(SUDOKU(seed=seed).solution.cells)
+    for i in rng.sample(range(81), holes):
+        cells[i] = 0
+
+    return cells
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_search_and_dlx_count_the_same(seed):
+    cells = holed(seed, 40 + seed % 4 * 3)
+
+    assert count_solutions(Board(cells), 0) == Sudoku_dlx.count(cells, 0)
+    assert count_solutions(Board(cells), 2) == Sudoku_dlx.count(cells, 2)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_dlx_solves_the_puzzle(seed):
+    sudoku = SUDOKU(seed=seed)
+    assert Sudoku_dlx.solve(list(sudoku.orig_puzzle.cells)) == list(sudoku.solution.cells)
+
+
+def test_dead_board_has_no_solution():
+    dead = [0] * 81
+    dead[:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+    dead[17] = 9  # cell 8 has no candidate left
+
+    assert Sudoku_dlx.count(dead, 0) == 0
+    assert Sudoku_dlx.solve(dead) is None
+
+
+def test_backends_of_sudoku_agree():
+    sudoku = SUDOKU(seed=11)
+    grid = sudoku.orig_puzzle.to_lists()
+
+    assert sudoku.solve(grid, 'dlx') == sudoku.solve(grid, 'backtrack') == sudoku.solution.to_lists()
+    assert sudoku.count_solutions(grid, 0, 'dlx') == sudoku.count_solutions(grid, 0, 'backtrack') == 1
+
+    with pytest.raises(ValueError):
+        sudoku.solve(grid, 'unknown')
@@ -0,0 +1,171 @@
+from random import Random
+
+import pytest
+
+from Sudoku_core import SUDOKU
+from Sudoku_engine import Board, SearchResult, count_solutions, fits, from_string, generate, search
+from Sudoku_grader import generate as generate_level
+from Sudoku_stats import Stats
+
+
+def scanned_fits(grid: list[list], row: int, col: int, number: int) -> bool:
+    """valid_location as the list scans of row, column and nonet did it"""
+    if number in grid[row] or number in [line[col] for line in grid]:
+        return False
+
+    top, left = row // 3 * 3, col // 3 * 3
+    return all(number not in line[left:left + 3] for line in grid[top:top + 3])
+
+
+def random_grid(seed: int, picks: int = 45) -> list[list]:
+    """returns solution of a game with up to picks random cells emptied"""
+    rng = Random(seed)
+    grid = SUDOKU(seed=seed).solution.to_lists()
+    for _ in range(picks):
+        grid[rng.randrange(9)][rng.randrange(9)] = 0
+
+    return grid
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_valid_location_matches_list_scans(seed):
+    sudoku = SUDOKU(seed=seed)
+    grid = random_grid(seed)
+
+    for row in range(9):
+        for col in range(9):
+            if grid[row][col]:
+                continue
+
+            for number in range(1, 10):
+                assert sudoku.valid_location(grid, row, col, number) == scanned_fits(grid, row, col, number)
+                assert fits(grid, row, col, number) == scanned_fits(grid, row, col, number)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_board_masks_match_list_scans(seed):
+    grid = random_grid(seed)
+    board = Board.from_grid(grid)
+
+    for i, number in enumerate(board.cells):
+        row, col = divmod(i, 9)
+        if not number:
+            expected = [n for n in range(1, 10) if scanned_fits(grid, row, col, n)]
+            assert [n for n in range(1, 10) if board.can_place(i, n)] == expected
+
+    assert board.to_grid() == grid
+
+
+def test_place_and_remove_keep_masks():
+    board = Board()
+    board.place(0, 5)
+    assert not board.can_place(8, 5) and not board.can_place(72, 5) and not board.can_place(20, 5)
+    assert board.can_place(30, 5)
+
+    assert board.remove(0) == 5
+    assert board.rows == Board().rows and board.cols == Board().cols and board.boxes == Board().boxes
+
+
+def test_duplicates_are_rejected():
+    with pytest.raises(ValueError):
+        Board([1, 1] + [0] * 79)
+
+    grid = [[0] * 9 for _ in range(9)]
+    grid[0][0] = grid[8][0] = 4
+    assert not SUDOKU(seed=1).validate_sudoku(grid)
+
+
+def test_generated_game_is_solved():
+    sudoku = SUDOKU(seed=2)
+
+    assert 0 not in sudoku.solution.cells
+    assert sudoku.validate_sudoku(sudoku.solution.to_lists())
+    assert all(not number or number == sudoku.solution.cells[i] for i, number in enumerate(sudoku.orig_puzzle.cells))
+
+
+def scanned_count(grid: list[list]) -> int:
+    """counts every solution with plain backtracking on the list scans"""
+    for row in range(9):
+        for col in range(9):
+            if not grid[row][col]:
+                found = 0
+                for number in range(1, 10):
+                    if scanned_fits(grid, row, col, number):
+                        grid[row][col] = number
+                        found += scanned_count(grid)
+                        grid[row][col] = 0
+
+                return found
+
+    return 1
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_count_matches_plain_backtracking(seed):
+    sudoku = SUDOKU(seed=seed)
+    grid = random_grid(seed, 70)  # 4 - 58 solutions
+    expected = scanned_count([line.copy() for line in grid])
+
+    assert sudoku.count_solutions(grid, 0) == expected
+    assert sudoku.count_solutions(grid, 2) == min(expected, 2)
+
+
+def test_count_stops_at_the_limit():
+    sudoku = SUDOKU(seed=1)
+    empty = [[0] * 9 for _ in range(9)]
+
+    assert sudoku.count_solutions(empty, 1) == 1
+    assert sudoku.count_solutions(empty, 2) == 2
+    assert sudoku.count_solutions(empty, 50) == 50
+    assert sudoku.count_solutions(sudoku.orig_puzzle.to_lists(), 2) == 1
+
+
+@pytest.mark.parametrize('box', [2, 4])
+def test_other_board_sizes(box):
+    puzzle, solution = generate(1, box)
+    size = box * box
+
+    assert len(puzzle) == size * size
+    assert 0 not in solution and Board(solution).cells == solution  # no duplicates
+    assert all(not number or number == solution[i] for i, number in enumerate(puzzle))
+    assert count_solutions(Board(puzzle), 2) == 1
+
+
+@pytest.mark.parametrize('box', [2, 4, 5])
+def test_game_on_other_board_sizes(box):
+    sudoku = SUDOKU(seed=3, box=box)
+    size = box * box
+    row, col = divmod(sudoku.Puzzle.cells.index(0), size)
+
+    assert len(sudoku.Puzzle) == size and sudoku.validate_sudoku(sudoku.solution.to_lists())
+    assert sudoku.place_number(row, col, size)
+    assert sudoku.placement_error(row, col, size + 1) is not None
+
+
+def test_search_deduces_before_guessing():
+    for difficulty in ('easy', 'hard'):
+        puzzle, solution, _ = generate_level(1, difficulty)  # solved by singles, pointing and naked pairs
+        stats = Stats()
+        result = search(Board(puzzle), 2, stats=stats)
+
+        assert (result.found, result.complete, result.solution) == (1, True, solution)
+        assert result.deduced == stats.deduced == puzzle.count(0)
+        assert stats.nodes <= 1
+
+
+def test_dead_cell_is_found_without_a_guess():
+    dead = [0] * 81
+    dead[:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+    dead[17] = 9  # cell 8 has no candidate left
+    stats = Stats()
+
+    assert search(Board(dead), 2, stats=stats) == SearchResult(0, None, True)
+    assert stats.nodes == 0
+
+
+def test_hard_puzzle_is_solved():
+    puzzle = from_string('800000000003600000070090200050007000000045700000100030001000068008500010090000400')
+    result = search(Board(puzzle), 2)
+
+    assert result.found == 1 and result.complete
+    assert all(not number or number == result.solution[i] for i, number in enumerate(puzzle))
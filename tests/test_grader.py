@@ -0,0 +1,40 @@
+import pytest
+
+from Sudoku_batch import make_record
+from Sudoku_core import SUDOKU
+from Sudoku_engine import Board, from_string, generate
+from Sudoku_grader import LEVELS, generate as generate_level, grade
+
+
+@pytest.mark.parametrize('difficulty', ['easy', 'medium', 'hard'])
+def test_generate_hits_the_level(difficulty):
+    for seed in range(2):
+        puzzle, solution, result = generate_level(seed, difficulty)
+
+        assert result.level == difficulty
+        assert grade(puzzle) == result
+        assert result.solved and Board(puzzle).cells == puzzle
+        assert all(not number or number == solution[i] for i, number in enumerate(puzzle))
+
+
+def test_unknown_level():
+    with pytest.raises(ValueError):
+        generate_level(1, 'unknown')
+
+    with pytest.raises(ValueError):
+        SUDOKU(seed=1, difficulty='unknown')
+
+
+def test_grade_of_solved_and_empty_boards():
+    _, solution = generate(1)
+    assert grade(solution).level == 'easy' and grade(solution).score == 0
+    assert grade([0] * 81).level == 'expert' and not grade([0] * 81).solved
+    assert {grade(generate(seed)[0]).level for seed in range(5)} <= set(LEVELS)
+
+
+def test_game_and_record_of_a_level():
+    sudoku = SUDOKU(seed=4, difficulty='medium')
+    assert sudoku.grade().level == 'medium'
+
+    record = make_record(4, 'hard')
+    assert grade(from_string(record.puzzle)).level == 'hard'
@@ -0,0 +1,64 @@
+import pytest
+
+from Sudoku_core import SUDOKU
+from Sudoku_grid import Grid, LockedCells
+
+
+def test_grid_behaves_like_nested_lists():
+    lists = SUDOKU(seed=1).orig_puzzle.to_lists()
+    grid = Grid.from_lists(lists)
+
+    assert len(grid.cells) == 81 and grid == lists
+    assert [list(row) for row in grid] == lists
+    assert grid[2][3] == lists[2][3] and grid[-1][-1] == lists[-1][-1]
+    assert grid[4][1:4] == lists[4][1:4]
+    assert (lists[0][0] in grid[0]) and (10 not in grid[0])
+
+    grid[2][3] = 7
+    lists[2][3] = 7
+    assert grid == lists
+
+    with pytest.raises(IndexError):
+        grid[9]
+    with pytest.raises(IndexError):
+        grid[0][9] = 1
+
+
+def test_copy_shares_nothing():
+    grid = Grid.from_lists(SUDOKU(seed=2).solution.to_lists())
+    copy = grid.copy()
+    copy[0][0] = 0
+
+    assert grid[0][0] != 0 and grid != copy
+
+
+def test_other_sizes_and_bad_sizes():
+    assert Grid([0] * 16).size == 4 and Grid([0] * 256).size == 16
+
+    with pytest.raises(ValueError):
+        Grid([0] * 80)
+    with pytest.raises(ValueError):
+        Grid([0] * 36)  # 6 x 6 has no square boxes
+
+
+def test_locked_cells_behave_like_a_list_of_coordinates():
+    sudoku = SUDOKU(seed=3)
+    expected = [(row, col) for row in range(9) for col in range(9) if sudoku.orig_puzzle[row][col]]
+    locked = LockedCells.from_grid(sudoku.orig_puzzle)
+
+    assert list(locked) == expected and len(locked) == len(expected)
+    assert locked == expected and locked == sudoku.locked_coordinates
+    assert all(coordinate in locked for coordinate in expected)
+    assert (9, 0) not in locked and (-1, 0) not in locked
+
+    free = next((row, col) for row in range(9) for col in range(9) if (row, col) not in expected)
+    locked.add(free)
+    assert free in locked
+
+
+def test_orig_puzzle_is_a_real_copy():
+    sudoku = SUDOKU(seed=4)
+    row, col = next((row, col) for row in range(9) for col in range(9) if not sudoku.Puzzle[row][col])
+    sudoku.place_number(row, col, sudoku.solution[row][col])
+
+    assert sudoku.orig_puzzle[row][col] == 0
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+
+from Sudoku_gui import MainWindow  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def window(app):
+    window = MainWindow()
+    yield window
+    window.close()
+
+
+def open_cell(window) -> tuple[int, int]:
+    return next(coord for coord in sorted(window.cell_widgets) if coord not in window.sudoku.locked_coordinates)
+
+
+def test_cells_are_indexed_by_coordinates(window):
+    assert sorted(window.cell_widgets) == [(row, col) for row in range(9) for col in range(9)]
+
+    for (row, col), widget in window.cell_widgets.items():
+        assert widget.objectName().endswith(f'_{row}_{col}')
+        number = window.sudoku.Puzzle[row][col]
+        assert widget.text() == (str(number) if number else '')
+        assert widget.isReadOnly() == bool(number)
+
+
+def test_edit_is_placed_right_away(window):
+    row, col = open_cell(window)
+    widget = window.cell_widgets[row, col]
+
+    widget.textEdited.emit('5')
+    assert window.sudoku.Puzzle[row][col] == 5
+
+    widget.textEdited.emit('')
+    assert window.sudoku.Puzzle[row][col] == 0
+
+
+def test_refresh_skips_cells_that_show_the_state(window):
+    row, col = open_cell(window)
+    widget = window.cell_widgets[row, col]
+    changes = []
+    set_text = widget.setText
+    widget.setText = lambda text: (changes.append(text), set_text(text))
+
+    state = {(row, col): ('7', 'color: red;', True)}
+    window.refresh_cells(state)
+    window.refresh_cells(state)
+
+    assert changes == ['7'] and widget.text() == '7' and widget.isReadOnly()
+    assert widget.styleSheet() == 'color: red;'
+
+
+@pytest.mark.parametrize('box', [2, 4])
+def test_board_size_builds_new_cells(window, box):
+    window.set_box(box)
+    size = box * box
+
+    assert sorted(window.cell_widgets) == [(row, col) for row in range(size) for col in range(size)]
+    assert window.sudoku.box == box and len(window.sudoku.Puzzle) == size
+
+    row, col = open_cell(window)
+    window.cell_widgets[row, col].textEdited.emit('2')
+    assert window.sudoku.Puzzle[row][col] == 2
+
+
+def test_undo_of_auto_solve_reopens_the_cells(window):
+    row, col = open_cell(window)
+    right = window.sudoku.solution[row][col]
+    window.cell_widgets[row, col].setText(str(right))
+    window.cell_widgets[row, col].textEdited.emit(str(right))  # as typed
+
+    window.auto_solve()
+    assert all(widget.isReadOnly() for widget in window.cell_widgets.values())
+    assert 'green' in window.cell_widgets[row, col].styleSheet()
+
+    window.undo_move()
+    for coord, widget in window.cell_widgets.items():
+        if coord in window.sudoku.locked_coordinates:
+            continue
+
+        number = window.sudoku.Puzzle[coord[0]][coord[1]]
+        assert widget.text() == (str(number) if number else '')
+        assert not widget.isReadOnly() and 'green' not in widget.styleSheet()
+
+    assert window.cell_widgets[row, col].text() == str(right)
+
+    window.redo_move()
+    assert window.sudoku.Puzzle == window.sudoku.solution
+    assert all(widget.text() for widget in window.cell_widgets.values())
@@ -0,0 +1,47 @@
+import pytest
+
+from Sudoku_core import SUDOKU
+from Sudoku_engine import Board, candidate_masks
+from Sudoku_grader import find_hint
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_hints_follow_the_grader_and_solve_the_puzzle(seed):
+    sudoku = SUDOKU(seed=seed)
+    size = sudoku.Puzzle.size
+
+    while 0 in sudoku.Puzzle.cells:
+        hint = sudoku.next_hint()
+        if hint is None:
+            assert find_hint(candidate_masks(Board(sudoku.Puzzle.cells))) is None
+            break
+
+        assert hint == find_hint(candidate_masks(Board(sudoku.Puzzle.cells)))
+        assert hint.number == sudoku.solution[hint.row][hint.col]
+        assert sudoku.next_hint() is hint  # kept until the puzzle changes
+        sudoku.place_number(hint.row, hint.col, hint.number)
+
+        # candidates kept by the moves match a rescan
+        masks = candidate_masks(Board(sudoku.Puzzle.cells))
+        candidates = sudoku.candidates()
+        for i, mask in enumerate(masks):
+            if not sudoku.Puzzle.cells[i]:
+                assert candidates[i // size, i % size] == [n for n in range(1, size + 1) if mask >> n & 1]
+
+    if sudoku.grade().solved:
+        assert sudoku.Puzzle == sudoku.solution
+
+
+def test_wrong_number_is_hinted_first():
+    sudoku = SUDOKU(seed=2)
+    size = sudoku.Puzzle.size
+    i = sudoku.Puzzle.cells.index(0)
+    row, col = divmod(i, size)
+    right = sudoku.solution[row][col]
+    sudoku.place_number(row, col, right % size + 1)
+
+    hint = sudoku.next_hint()
+    assert (hint.row, hint.col, hint.number, hint.technique) == (row, col, right, 'mistake')
+
+    sudoku.undo()
+    assert sudoku.next_hint().technique != 'mistake'
@@ -0,0 +1,146 @@
+from random import Random
+
+import pytest
+
+from Sudoku_core import SUDOKU
+from Sudoku_history import History, Move
+
+
+def open_cells(sudoku: SUDOKU) -> list[tuple[int, int]]:
+    size = sudoku.Puzzle.size
+    return [divmod(i, size) for i, number in enumerate(sudoku.orig_puzzle.cells) if not number]
+
+
+def test_undo_redo_round_trip():
+    sudoku = SUDOKU(seed=3)
+    rng = Random(0)
+    cells = open_cells(sudoku)
+    states = [bytes(sudoku.Puzzle.cells)]
+
+    for _ in range(30):
+        row, col = rng.choice(cells)
+        number = rng.randint(0, 9)
+        if sudoku.Puzzle[row][col] != number:
+            sudoku.place_number(row, col, number)
+            states.append(bytes(sudoku.Puzzle.cells))
+
+    for state in reversed(states[:-1]):
+        assert sudoku.undo()
+        assert bytes(sudoku.Puzzle.cells) == state
+
+    assert sudoku.undo() == []
+
+    for state in states[1:]:
+        assert sudoku.redo()
+        assert bytes(sudoku.Puzzle.cells) == state
+
+    assert sudoku.redo() == []
+
+
+def test_snapshot_restore_and_seek():
+    sudoku = SUDOKU(seed=4)
+    (r1, c1), (r2, c2) = open_cells(sudoku)[:2]
+
+    start = sudoku.snapshot()
+    sudoku.place_number(r1, c1, 1)
+    middle = sudoku.snapshot()
+    middle_state = bytes(sudoku.Puzzle.cells)
+    sudoku.place_number(r2, c2, 2)
+    end_state = bytes(sudoku.Puzzle.cells)
+    end = sudoku.snapshot()
+
+    sudoku.restore(start)
+    assert sudoku.Puzzle == sudoku.orig_puzzle
+    sudoku.restore(end)
+    assert bytes(sudoku.Puzzle.cells) == end_state
+    sudoku.restore(middle)
+    assert bytes(sudoku.Puzzle.cells) == middle_state
+
+    # a new move after going back drops the moves after it, and the snapshots in them
+    sudoku.place_number(r2, c2, 3)
+    with pytest.raises(ValueError):
+        sudoku.restore(end)
+
+    sudoku.restore(middle)
+    assert bytes(sudoku.Puzzle.cells) == middle_state
+
+
+def test_fill_solution_is_one_move_and_leaves_solution_alone():
+    sudoku = SUDOKU(seed=5)
+    solution = bytes(sudoku.solution.cells)
+    row, col = open_cells(sudoku)[0]
+    sudoku.place_number(row, col, sudoku.solution[row][col])
+
+    changed = sudoku.fill_solution()
+    assert (row, col) not in changed
+    assert sudoku.Puzzle == sudoku.solution and sudoku.Puzzle is not sudoku.solution
+
+    sudoku.place_number(row, col, 0)
+    assert bytes(sudoku.solution.cells) == solution
+
+    sudoku.undo()
+    sudoku.undo()  # whole fill at once
+    expected = sudoku.orig_puzzle.copy()
+    expected[row][col] = sudoku.solution[row][col]
+    assert sudoku.Puzzle == expected
+
+
+def test_history_bytes_round_trip():
+    history = History()
+    history.record(5, 0, 3)
+    history.record(6, 0, 4, joined=True)
+    history.record(80, 2, 9)
+    history.undo()
+
+    copy = History.from_bytes(history.to_bytes(), history.cursor)
+    assert list(copy) == list(history) == [Move(5, 0, 3), Move(6, 0, 4)]
+    assert copy.redo() == [(80, 9)]
+    assert copy.undo() == [(80, 2)]
+    assert copy.undo() == [(6, 0), (5, 0)]
+
+    with pytest.raises(ValueError):
+        History.from_bytes(history.to_bytes(), 4)
+
+
+def test_replaced_puzzle_clears_history():
+    sudoku = SUDOKU(seed=6)
+    row, col = open_cells(sudoku)[0]
+    sudoku.place_number(row, col, 1)
+
+    sudoku.Puzzle = sudoku.orig_puzzle.to_lists()
+    assert sudoku.undo() == []
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_snapshots_are_dropped_exactly_when_their_moves_are(seed):
+    rng = Random(seed)
+    history = History()
+    made = []  # unique id of every move in the log, the moves a snapshot was taken on are still there if these are
+    taken = []
+    ids = iter(range(10 ** 6))
+
+    for _ in range(300):
+        action = rng.random()
+        if action < 0.4:
+            del made[history.cursor:]
+            history.record(rng.randrange(81), 0, rng.randint(1, 9))
+            made.append(next(ids))
+        elif action < 0.65:
+            history.undo()
+        elif action < 0.8:
+            history.redo()
+        elif action < 0.9:
+            taken.append((history.snapshot(), made[:history.cursor]))
+        elif action < 0.98 and taken:
+            snapshot, moves = rng.choice(taken)
+            assert history.is_valid(snapshot) == (made[:snapshot.position] == moves)
+            if history.is_valid(snapshot):
+                history.seek(snapshot)
+        elif action >= 0.98:
+            history.clear()
+            made.clear()  # new moves get new ids, so moves of the old game never match again
+
+    for snapshot, moves in taken:
+        assert history.is_valid(snapshot) == (made[:snapshot.position] == moves)
+
+    assert len(history.moves) * 4 == len(history.to_bytes())
@@ -0,0 +1,59 @@
+import io
+
+import pytest
+
+from Sudoku_batch import PuzzleRecord, iter_puzzles, make_record, puzzle_seeds
+from Sudoku_engine import generate
+from Sudoku_io import RECORD_SIZE, pack_record, read_puzzles, unpack_record, write_puzzles
+
+
+def records(n: int) -> list[PuzzleRecord]:
+    return [make_record(seed) for seed in range(n)]
+
+
+def test_record_round_trip():
+    puzzle, solution = generate(1)
+    data = pack_record(puzzle, solution)
+
+    assert len(data) == RECORD_SIZE == 52
+    assert unpack_record(data) == (puzzle, solution)
+
+
+def test_text_round_trip():
+    file = io.StringIO()
+    assert write_puzzles(file, iter(records(5)), 'text', solutions=True, chunk=2) == 5
+
+    file.seek(0)
+    assert list(read_puzzles(file)) == [(record.puzzle, record.solution) for record in records(5)]
+
+    file = io.StringIO()
+    write_puzzles(file, records(2), 'text')
+    file.seek(0)
+    assert [solution for _, solution in read_puzzles(file)] == [None, None]
+
+
+def test_binary_round_trip():
+    file = io.BytesIO()
+    assert write_puzzles(file, records(5), 'binary', chunk=2) == 5
+    assert len(file.getvalue()) == 5 * RECORD_SIZE
+
+    file.seek(0)
+    assert list(read_puzzles(file, 'binary')) == [(record.puzzle, record.solution) for record in records(5)]
+
+    with pytest.raises(ValueError):
+        list(read_puzzles(io.BytesIO(file.getvalue()[:-1]), 'binary'))
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        write_puzzles(io.StringIO(), records(1), 'xml')
+    with pytest.raises(ValueError):
+        list(read_puzzles(io.StringIO(), 'xml'))
+
+
+def test_puzzles_are_streamed():
+    puzzles = iter_puzzles(workers=1, seed=1)  # endless
+    first = [next(puzzles) for _ in range(3)]
+
+    assert first == list(iter_puzzles(3, workers=1, seed=1))
+    assert [record.seed for record in first] == puzzle_seeds(1, 3)
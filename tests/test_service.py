@@ -0,0 +1,162 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Sudoku_batch import make_record
+from Sudoku_engine import from_string
+from Sudoku_service import LINE_LIMIT, SudokuService
+
+
+class FakePool:
+    """pool that hands out the puzzle of seed 3 right away, solving runs in a thread"""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(1)
+
+    async def get(self):
+        return make_record(3)
+
+    def stats(self) -> dict:
+        return {'ready': 1}
+
+
+@pytest.fixture
+def call():
+    service = SudokuService(FakePool())
+
+    def call(request) -> dict:
+        line = request if isinstance(request, bytes) else json.dumps(request).encode()
+        return asyncio.run(service.handle_line(line))
+
+    call.service = service
+    yield call
+    service.pool.executor.shutdown()
+
+
+def open_cell(puzzle: str) -> tuple[int, int]:
+    return divmod(puzzle.index('.'), 9)
+
+
+def test_game_round(call):
+    new = call({'cmd': 'new', 'id': 7})
+    assert new['ok'] and new['id'] == 7
+    game, puzzle = new['game'], new['puzzle']
+    solution = from_string(make_record(3).solution)
+    row, col = open_cell(puzzle)
+
+    placed = call({'cmd': 'place', 'game': game, 'row': row, 'col': col, 'number': solution[row * 9 + col]})
+    assert placed == {'ok': True, 'placed': True}
+
+    assert call({'cmd': 'validate', 'game': game}) == {'ok': True, 'valid': True, 'complete': False, 'conflicts': []}
+    assert call({'cmd': 'solve', 'game': game})['solution'] == make_record(3).solution
+    assert call({'cmd': 'solve', 'puzzle': puzzle}) == {'ok': True, 'solution': make_record(3).solution, 'complete': True}
+    assert call({'cmd': 'stats'}) == {'ok': True, 'ready': 1, 'games': 1}
+
+    assert call({'cmd': 'close', 'game': game}) == {'ok': True}
+    assert not call({'cmd': 'validate', 'game': game})['ok']
+
+
+def test_refused_place_has_a_reason(call, capsys):
+    game = call({'cmd': 'new'})['game']
+    puzzle = make_record(3).puzzle
+    given = next(i for i, char in enumerate(puzzle) if char != '.')
+
+    response = call({'cmd': 'place', 'game': game, 'row': given // 9, 'col': given % 9, 'number': 1})
+    assert response['ok'] and not response['placed'] and response['reason']
+
+    for number in (10, -1, 10 ** 30):
+        response = call({'cmd': 'place', 'game': game, 'row': 0, 'col': 0, 'number': number})
+        assert response['ok'] and not response['placed'] and response['reason']
+
+    response = call({'cmd': 'place', 'game': game, 'row': 10 ** 30, 'col': 0, 'number': 1})
+    assert response['ok'] and not response['placed'] and response['reason']
+
+    assert capsys.readouterr().out == ''  # reasons go to the client only
+
+
+@pytest.mark.parametrize('request_', [
+    {'cmd': 'place', 'game': 1, 'row': '1', 'col': 0, 'number': 1},
+    {'cmd': 'place', 'game': 1, 'row': True, 'col': 0, 'number': 1},
+    {'cmd': 'place', 'game': 1, 'row': 0, 'col': 0},
+    {'cmd': 'place', 'game': [1], 'row': 0, 'col': 0, 'number': 1},
+    {'cmd': 'solve', 'puzzle': 5},
+    {'cmd': 'unknown'},
+    [1, 2],
+])
+def test_bad_requests_are_answered(call, request_):
+    call({'cmd': 'new'})
+    response = call(request_)
+
+    assert response['ok'] is False and response['error']
+    assert 'Internal error' not in response['error']
+
+
+def test_puzzle_with_duplicates_has_no_solution(call):
+    assert call({'cmd': 'solve', 'puzzle': '1' * 81}) == {'ok': True, 'solution': None, 'complete': True}
+
+
+def test_unexpected_error_is_answered(call, monkeypatch):
+    game = call({'cmd': 'new'})['game']
+
+    def broken():
+        raise AttributeError('broken')
+
+    monkeypatch.setattr(call.service.games[game], 'conflicts', broken)
+    response = call({'cmd': 'validate', 'game': game, 'id': 'x'})
+
+    assert response == {'ok': False, 'error': 'Internal error: AttributeError', 'id': 'x'}
+    assert call({'cmd': 'stats'})['ok']
+
+
+def test_bad_json_is_answered(call):
+    response = call(b'{not json')
+    assert response['ok'] is False and response['error']
+
+
+def test_long_line_is_skipped_and_the_client_stays(call):
+    async def talk() -> list[dict]:
+        server = await asyncio.start_server(call.service.handle_client, '127.0.0.1', 0, limit=LINE_LIMIT)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"cmd": "stats", "pad": "' + b'x' * (3 * LINE_LIMIT) + b'"}\n')
+            writer.write(b'{"cmd": "stats", "id": 1}\n' + b'x' * (LINE_LIMIT + 10) + b'\n{"cmd": "stats", "id": 2}')
+            writer.write_eof()
+
+            responses = [json.loads(line) async for line in reader]
+            writer.close()
+            return responses
+
+    responses = asyncio.run(talk())
+
+    assert [response['ok'] for response in responses] == [False, True, False, True]
+    assert 'longer' in responses[0]['error'] and 'longer' in responses[2]['error']
+    assert [responses[1]['id'], responses[3]['id']] == [1, 2]
+
+
+def test_undo_and_redo(call):
+    game, puzzle = (lambda new: (new['game'], new['puzzle']))(call({'cmd': 'new'}))
+    solution = from_string(make_record(3).solution)
+    row, col = open_cell(puzzle)
+    call({'cmd': 'place', 'game': game, 'row': row, 'col': col, 'number': solution[row * 9 + col]})
+
+    assert call({'cmd': 'undo', 'game': game})['changed'] == [[row, col, 0]]
+    assert call({'cmd': 'undo', 'game': game})['changed'] == []
+    assert call({'cmd': 'redo', 'game': game})['changed'] == [[row, col, solution[row * 9 + col]]]
+    assert call({'cmd': 'redo', 'game': game})['changed'] == []
+
+
+def test_hint_and_candidates(call):
+    game, puzzle = (lambda new: (new['game'], new['puzzle']))(call({'cmd': 'new'}))
+    solution = from_string(make_record(3).solution)
+
+    hint = call({'cmd': 'hint', 'game': game})['hint']
+    assert hint['number'] == solution[hint['row'] * 9 + hint['col']]
+    assert set(hint) == {'row', 'col', 'number', 'technique', 'after'}
+
+    candidates = call({'cmd': 'candidates', 'game': game})['candidates']
+    assert len(candidates) == puzzle.count('.')
+    assert all(solution[r * 9 + c] in numbers for r, c, numbers in candidates)
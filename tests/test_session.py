@@ -0,0 +1,143 @@
+import struct
+
+import pytest
+
+from Sudoku_core import SUDOKU
+from Sudoku_session import FILE_HEADER, MAGIC, Sessions, load_sessions, pack_session, save_sessions, unpack_session
+
+
+def assert_same_game(a: SUDOKU, b: SUDOKU):
+    assert a.Puzzle == b.Puzzle
+    assert a.orig_puzzle == b.orig_puzzle
+    assert a.solution == b.solution
+    assert a.locked_coordinates == b.locked_coordinates
+    assert a.ID == b.ID
+    assert list(a.history.moves) == list(b.history.moves) and a.history.cursor == b.history.cursor
+    assert sorted(a.conflicts()) == sorted(b.conflicts())
+
+
+def played(seed: int, box: int = 3) -> SUDOKU:
+    sudoku = SUDOKU(seed=seed, box=box)
+    size = sudoku.Puzzle.size
+    empty = [i for i, number in enumerate(sudoku.Puzzle.cells) if not number]
+
+    sudoku.place_number(*divmod(empty[0], size), size)
+    sudoku.place_number(*divmod(empty[1], size), 1)
+    sudoku.fill_solution()
+    sudoku.undo()
+    return sudoku
+
+
+@pytest.mark.parametrize('box', [2, 3, 4, 5])
+def test_record_round_trip(box):
+    sudoku = played(1, box)
+    copy = unpack_session(pack_session(sudoku))
+
+    assert_same_game(sudoku, copy)
+    assert copy.redo()
+    assert copy.Puzzle == copy.solution
+
+
+def test_new_game_takes_70_bytes():
+    sudoku = SUDOKU(seed=2)
+    assert len(pack_session(sudoku)) == 70
+
+
+def test_replaced_puzzle_is_saved():
+    sudoku = played(3)
+    sudoku.Puzzle = [list(row) for row in sudoku.solution]  # nested lists, outside the history
+    copy = unpack_session(pack_session(sudoku))
+
+    assert copy.Puzzle == copy.solution
+    assert_same_game(sudoku, copy)
+
+
+def test_broken_record():
+    record = pack_session(played(4))
+    with pytest.raises(ValueError):
+        unpack_session(record[:-1])
+
+    # last move is undone, it is checked as well
+    for cell, old, new in [(81, 0, 1), (0x7fff, 0, 1), (0, 10, 1), (0, 0, 255)]:
+        broken = record[:-4] + (cell << 16 | old << 8 | new).to_bytes(4, 'little')
+        with pytest.raises(ValueError, match='not a move'):
+            unpack_session(broken)
+
+
+def test_file_round_trip_is_lazy(tmp_path):
+    path = str(tmp_path / 'games.bin')
+    games = {key: played(key) for key in range(1, 6)}
+    assert save_sessions(path, games) == 5
+
+    with load_sessions(path) as loaded:
+        assert len(loaded) == 5 and not loaded.games
+        assert_same_game(loaded[3], games[3])
+        assert list(loaded.games) == [3]
+
+        del loaded[4]
+        assert 4 not in loaded and len(loaded) == 4
+
+        # file can be replaced while it is mapped
+        assert save_sessions(path, loaded) == 4
+        assert_same_game(loaded[5], games[5])
+
+    assert loaded.data is None
+    assert_same_game(loaded[1], games[1])  # copied out of the map when it was closed
+
+    again = load_sessions(path)
+    assert sorted(again) == [1, 2, 3, 5]
+    for key in again:
+        assert_same_game(again[key], games[key])
+    again.close()
+
+
+def test_bad_files(tmp_path):
+    path = tmp_path / 'bad.bin'
+
+    path.write_bytes(b'')
+    with pytest.raises(ValueError):
+        load_sessions(str(path))
+
+    path.write_bytes(FILE_HEADER.pack(b'XXXX', 1))
+    with pytest.raises(ValueError):
+        load_sessions(str(path))
+
+    path.write_bytes(FILE_HEADER.pack(MAGIC, 99))
+    with pytest.raises(ValueError, match='version'):
+        load_sessions(str(path))
+
+    path.write_bytes(FILE_HEADER.pack(MAGIC, 1) + b'\x01\x02')
+    with pytest.raises(ValueError, match='Truncated'):
+        load_sessions(str(path))
+
+
+def test_sessions_mapping():
+    sessions = Sessions()
+    sessions[1] = SUDOKU(seed=1)
+    assert 1 in sessions and len(sessions) == 1
+    with pytest.raises(KeyError):
+        sessions[2]
+
+
+@pytest.mark.parametrize('seed', [0, 2 ** 64 - 1, -1, -128, -2 ** 80, 2 ** 64, 2 ** 70])
+def test_any_seed_is_saved(seed, tmp_path):
+    sudoku = SUDOKU.from_puzzle(SUDOKU(seed=1).orig_puzzle, SUDOKU(seed=1).solution, seed)
+    copy = unpack_session(pack_session(sudoku))
+    assert copy.ID == seed and copy.Puzzle == sudoku.Puzzle
+
+    path = str(tmp_path / 'games.bin')
+    assert save_sessions(path, {1: SUDOKU(seed=1), 2: sudoku}) == 2
+    with load_sessions(path) as loaded:
+        assert loaded[2].ID == seed and loaded[1].ID == 1
+
+
+def test_failed_save_keeps_the_last_file(tmp_path):
+    path = tmp_path / 'games.bin'
+    save_sessions(str(path), {1: SUDOKU(seed=1)})
+    saved = path.read_bytes()
+
+    with pytest.raises(struct.error):
+        save_sessions(str(path), {2: SUDOKU(seed=2), -1: SUDOKU(seed=3)})  # keys are unsigned
+
+    assert path.read_bytes() == saved
+    assert [file.name for file in tmp_path.iterdir()] == ['games.bin']
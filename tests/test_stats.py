@@ -0,0 +1,47 @@
+import os
+import pickle
+import pstats
+
+from Sudoku_core import SUDOKU
+from Sudoku_engine import generate
+from Sudoku_stats import Stats, profile
+
+
+def test_stats_count_work_without_changing_it():
+    stats = Stats()
+    assert generate(2, stats=stats) == generate(2)
+
+    assert stats.nodes > 0 and stats.checks > 0 and stats.unique_checks > 0
+    assert set(stats.timers) == {'fill', 'remove', 'verify'}
+    assert stats.timers['verify'] <= stats.timers['remove']
+
+
+def test_callback_is_told_about_every_phase():
+    phases = []
+    stats = Stats(lambda name, seconds, _: phases.append(name))
+    SUDOKU(seed=3, stats=stats)
+
+    assert set(phases) == {'fill', 'remove', 'verify'} and phases[-1] == 'remove'
+
+
+def test_stats_add_up_and_pickle():
+    first, second = Stats(), Stats()
+    generate(1, stats=first)
+    generate(2, stats=second)
+
+    total = pickle.loads(pickle.dumps(first))
+    total.add(second)
+    assert total.nodes == first.nodes + second.nodes
+    assert total.timers['fill'] == first.timers['fill'] + second.timers['fill']
+
+    total.reset()
+    assert total.as_dict() == Stats().as_dict()
+
+
+def test_profile_is_saved(tmp_path):
+    path = str(tmp_path / 'generate.prof')
+    with profile(path):
+        generate(1)
+
+    assert os.path.exists(path)
+    assert any(name == 'generate' for _, _, name in pstats.Stats(path).stats)
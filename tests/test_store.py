@@ -0,0 +1,48 @@
+import pytest
+
+from Sudoku_engine import generate
+from Sudoku_store import PuzzleStore, canonical
+
+
+def equivalent(cells: list[int]) -> list[int]:
+    """transposes the grid, swaps the top two bands and relabels digit d as 10 - d"""
+    rows = [cells[col * 9 + row] for row in range(9) for col in range(9)]
+    rows = rows[27:54] + rows[:27] + rows[54:]
+    return [10 - number if number else 0 for number in rows]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_equivalent_puzzles_have_the_same_canonical_form(seed):
+    puzzle, solution = generate(seed)
+    form = canonical(puzzle, solution)
+
+    assert canonical(equivalent(puzzle), equivalent(solution)) == form
+    assert canonical(*generate(seed + 100)) != form
+    assert len(form[0]) == len(form[1]) == 81
+
+
+def test_store_skips_equivalent_puzzles(tmp_path):
+    puzzle, solution = generate(7)
+
+    with PuzzleStore(str(tmp_path / 'puzzles.db')) as store:
+        assert store.add(puzzle, solution, seed=7)
+        assert not store.add(equivalent(puzzle), equivalent(solution))
+        assert store.add(*generate(8), seed=2 ** 64 - 1)  # seeds above the signed range of SQLite
+        assert len(store) == 2
+
+        assert store.contains(equivalent(puzzle))
+        assert not store.contains(generate(9)[0])
+
+        taken = {store.take()[2], store.take()[2]}
+        assert taken == {7, 2 ** 64 - 1}
+        assert store.take() is None
+
+
+def test_store_is_filled_and_taken_by_level(tmp_path):
+    with PuzzleStore(str(tmp_path / 'puzzles.db')) as store:
+        assert store.fill(4, workers=1, seed=1, difficulty='easy') == 4
+
+        assert store.stats() == {'easy': {'stored': 4, 'served': 0}}
+        assert store.take('hard') is None
+        assert store.take('easy') is not None
+        assert store.stats()['easy']['served'] == 1
@@ -0,0 +1,107 @@
+from random import Random
+
+import pytest
+
+from Sudoku_core import SUDOKU
+from Sudoku_engine import Tracker, candidate_masks, Board, geometry_for
+from Sudoku_grid import Grid
+
+
+def rescanned_conflicts(cells) -> set[int]:
+    """cells that share their number with a cell of the same unit, found by looking at every unit"""
+    conflicts = set()
+    for unit in geometry_for(len(cells)).units:
+        for i in unit:
+            if cells[i] and any(j != i and cells[j] == cells[i] for j in unit):
+                conflicts.add(i)
+
+    return conflicts
+
+
+def rescanned_masks(cells) -> list[int]:
+    """candidate masks computed from scratch, wrong numbers of the player count as used"""
+    tables = geometry_for(len(cells))
+    masks = []
+    for i, number in enumerate(cells):
+        used = 0
+        for j in tables.peers[i]:
+            used |= 1 << cells[j]
+        masks.append(0 if number else tables.all_numbers & ~used & ~1)
+
+    return masks
+
+
+def assert_tracked(sudoku: SUDOKU):
+    cells = sudoku.Puzzle.cells
+    assert set(i for i in sudoku._track().conflicts) == rescanned_conflicts(cells)
+    assert sudoku.is_valid() == sudoku.validate_sudoku(sudoku.Puzzle)
+    assert sudoku._track().masks() == rescanned_masks(cells)
+
+
+@pytest.mark.parametrize('box', [2, 3])
+def test_direct_writes_and_place_number_keep_tracker_right(box):
+    sudoku = SUDOKU(seed=4, box=box)
+    size = sudoku.Puzzle.size
+    rng = Random(1)
+    empty = [(i // size, i % size) for i, number in enumerate(sudoku.Puzzle.cells) if not number]
+
+    for step in range(400):
+        row, col = rng.choice(empty)
+        number = rng.randint(0, size)
+
+        if step % 2:
+            sudoku.Puzzle[row][col] = number
+        else:
+            assert sudoku.place_number(row, col, number)
+
+        assert_tracked(sudoku)
+
+
+def test_direct_write_of_duplicate_is_a_conflict():
+    sudoku = SUDOKU(seed=4)
+    cells = sudoku.Puzzle.cells
+    i = cells.index(0)
+    row, col = divmod(i, 9)
+    clue = next(number for number in sudoku.Puzzle[row] if number)
+
+    sudoku.Puzzle[row][col] = clue
+    assert not sudoku.is_valid()
+    assert (row, col) in sudoku.conflicts()
+
+    sudoku.place_number(row, col, 0)
+    assert sudoku.is_valid()
+    assert_tracked(sudoku)
+    assert sudoku.next_hint() is not None
+
+
+def test_replaced_puzzle_is_tracked_again():
+    sudoku = SUDOKU(seed=2)
+    sudoku.Puzzle = [list(row) for row in sudoku.orig_puzzle]
+    sudoku.place_number(*divmod(sudoku.orig_puzzle.cells.index(0), 9), 1)
+    sudoku.Puzzle[0][0] = sudoku.Puzzle[0][0]
+    assert_tracked(sudoku)
+
+    sudoku.Puzzle = sudoku.solution
+    sudoku.place_number(*divmod(sudoku.orig_puzzle.cells.index(0), 9), 0)
+    assert 0 not in sudoku.solution.cells
+
+
+def test_tracker_rejects_numbers_out_of_range():
+    tracker = Tracker(bytearray(81))
+    with pytest.raises(ValueError):
+        tracker.set(0, 10)
+
+
+def test_tracker_masks_match_board_masks():
+    sudoku = SUDOKU(seed=7)
+    assert sudoku._track().masks() == candidate_masks(Board(sudoku.Puzzle.cells))
+
+
+def test_copy_of_tracked_grid_is_not_tracked():
+    sudoku = SUDOKU(seed=7)
+    copy = sudoku.Puzzle.copy()
+    assert isinstance(copy, Grid) and copy.tracker is None
+
+    i = copy.cells.index(0)
+    copy[i // 9][i % 9] = 5
+    assert sudoku.Puzzle.cells[i] == 0
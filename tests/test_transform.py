@@ -0,0 +1,71 @@
+from itertools import islice
+from random import Random
+
+import pytest
+
+import Sudoku_dlx
+from Sudoku_core import SUDOKU
+from Sudoku_engine import Board, count_solutions, generate
+from Sudoku_store import canonical
+from Sudoku_transform import FLIP, IDENTITY, MIRROR, ROTATE, TRANSPOSE, make, random_transform, variants
+
+
+def assert_valid_variant(puzzle, solution, new_puzzle, new_solution):
+    Board(new_solution)  # raises ValueError on duplicates
+    assert 0 not in new_solution
+    assert all(not number or number == new_solution[i] for i, number in enumerate(new_puzzle))
+    assert count_solutions(Board(new_puzzle), 2) == 1
+    assert new_puzzle.count(0) == puzzle.count(0)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_canonical_form_is_kept_by_random_transforms(seed):
+    puzzle, solution = generate(seed)
+    form = canonical(puzzle, solution)
+    rng = Random(seed)
+
+    for _ in range(5):
+        transform = random_transform(rng)
+        assert canonical(transform(puzzle), transform(solution)) == form
+
+
+def test_variants_stay_valid_and_unique():
+    puzzle, solution = generate(2)
+
+    for new_puzzle, new_solution in islice(variants(puzzle, solution, seed=1), 4):
+        assert_valid_variant(puzzle, solution, new_puzzle, new_solution)
+
+    assert list(islice(variants(puzzle, solution, seed=1), 3)) == list(islice(variants(puzzle, solution, seed=1), 3))
+
+
+def test_rotations_and_mirrors():
+    _, solution = generate(4)
+
+    assert MIRROR.then(MIRROR) == IDENTITY
+    assert TRANSPOSE.then(TRANSPOSE) == IDENTITY
+    assert ROTATE.then(ROTATE) == MIRROR.then(FLIP)
+    assert ROTATE.then(ROTATE).then(ROTATE).then(ROTATE)(solution) == solution
+
+
+def test_lines_must_stay_in_their_band():
+    with pytest.raises(ValueError):
+        make(rows=[3, 1, 2, 0, 4, 5, 6, 7, 8])
+    with pytest.raises(ValueError):
+        make(digits=[1] * 9)
+
+
+def test_vary_is_deterministic():
+    first, second = SUDOKU(seed=1), SUDOKU(seed=1)
+    first.vary(5)
+    second.vary(5)
+
+    assert first.Puzzle == second.Puzzle
+    assert Sudoku_dlx.solve(list(first.orig_puzzle.cells)) == list(first.solution.cells)
+
+
+@pytest.mark.parametrize('box', [2, 4])
+def test_variants_of_other_board_sizes(box):
+    puzzle, solution = generate(2, box)
+
+    for new_puzzle, new_solution in islice(variants(puzzle, solution, seed=1), 3):
+        assert_valid_variant(puzzle, solution, new_puzzle, new_solution)
@@ -0,0 +1,34 @@
+import pytest
+
+from Sudoku_core import SUDOKU
+from Sudoku_engine import generate
+
+np = pytest.importorskip('numpy')
+from Sudoku_validate import validate_many  # noqa: E402
+
+
+def test_validate_many_matches_validate_sudoku():
+    sudoku = SUDOKU(seed=1)
+    grids = []
+    for seed in range(6):
+        puzzle, solution = generate(seed)
+        grids += [solution, puzzle]
+
+    broken = list(grids[0])
+    broken[1] = broken[0]  # duplicate in row 0
+    grids.append(broken)
+    grids = np.array(grids).reshape(-1, 9, 9)
+
+    valid, conflicts = validate_many(grids, chunk=4)
+    assert valid.tolist() == [sudoku.validate_sudoku(grid.tolist()) for grid in grids]
+    assert valid.tolist() == [True] * 12 + [False]
+    assert (0, 0) in map(tuple, np.argwhere(conflicts[-1])) and (0, 1) in map(tuple, np.argwhere(conflicts[-1]))
+    assert not conflicts[:-1].any()
+
+    complete, _ = validate_many(grids, require_complete=True)
+    assert complete.tolist() == [True, False] * 6 + [False]
+
+
+def test_validate_many_checks_shape():
+    with pytest.raises(ValueError):
+        validate_many(np.zeros((2, 8, 8), dtype=int))